@@ -0,0 +1,121 @@
+import json
+import time
+
+import numpy as np
+import tensorflow as tf
+from absl import app, flags, logging
+
+from progressive_gan.model import Discriminator, Generator
+
+flags.DEFINE_integer('max_resolution',
+                     default=256,
+                     help='Highest resolution to benchmark')
+
+flags.DEFINE_integer('batch_size',
+                     default=16,
+                     help='Batch size used for every depth')
+
+flags.DEFINE_integer('latent_dim',
+                     default=512,
+                     help='Size of the generator latent vector')
+
+flags.DEFINE_integer('num_warmup_steps',
+                     default=5,
+                     help='Untimed steps run before timing')
+
+flags.DEFINE_integer('num_steps',
+                     default=20,
+                     help='Number of timed steps per depth')
+
+flags.DEFINE_string('output_path',
+                    default=None,
+                    help='Optional path to write the results as json')
+
+FLAGS = flags.FLAGS
+
+_DATA_FORMATS = ['channels_last', 'channels_first']
+_UNSUPPORTED_ERRORS = (tf.errors.InvalidArgumentError,
+                       tf.errors.NotFoundError,
+                       tf.errors.UnimplementedError)
+
+
+def benchmark_depth(depth, data_format):
+    generator = Generator(max_resolution=FLAGS.max_resolution,
+                          use_equalized_layers=True,
+                          data_format=data_format)
+    discriminator = Discriminator(max_resolution=FLAGS.max_resolution,
+                                  use_equalized_layers=True,
+                                  data_format=data_format)
+    generator.assign_depth(depth)
+    discriminator.assign_depth(depth)
+
+    @tf.function
+    def train_step(noise, alpha):
+        with tf.GradientTape() as tape:
+            fake_images = generator((noise, alpha))
+            scores = discriminator((fake_images, alpha))
+            loss = tf.reduce_mean(scores)
+
+        variables = \
+            generator.trainable_variables + discriminator.trainable_variables
+        gradients = tape.gradient(loss, variables)
+        return loss, gradients
+
+    noise = tf.random.normal([FLAGS.batch_size, FLAGS.latent_dim])
+    alpha = tf.constant(0.5)
+
+    for _ in range(FLAGS.num_warmup_steps):
+        loss, _ = train_step(noise, alpha)
+    loss.numpy()
+
+    step_times = []
+    for _ in range(FLAGS.num_steps):
+        start = time.perf_counter()
+        loss, _ = train_step(noise, alpha)
+        loss.numpy()
+        step_times.append(time.perf_counter() - start)
+
+    step_time = float(np.median(step_times))
+    return {
+        'step_time_ms': step_time * 1e3,
+        'images_per_sec': FLAGS.batch_size / step_time
+    }
+
+
+def main(_):
+    max_depth = int(np.log2(FLAGS.max_resolution))
+
+    results = {}
+    for depth in range(2, max_depth + 1):
+        resolution = 2**depth
+        results[str(depth)] = {}
+
+        for data_format in _DATA_FORMATS:
+            try:
+                result = benchmark_depth(depth, data_format)
+            except _UNSUPPORTED_ERRORS as e:
+                logging.warning('{} is not supported at {}x{}: {}'.format(
+                    data_format, resolution, resolution, e.message))
+                result = None
+            results[str(depth)][data_format] = result
+
+        channels_last = results[str(depth)]['channels_last']
+        channels_first = results[str(depth)]['channels_first']
+        if channels_last and channels_first:
+            logging.info(
+                '{}x{}: NHWC {:.2f} ms, NCHW {:.2f} ms, speedup {:.2f}x'
+                .format(resolution, resolution,
+                        channels_last['step_time_ms'],
+                        channels_first['step_time_ms'],
+                        channels_last['step_time_ms'] /
+                        channels_first['step_time_ms']))
+
+    if FLAGS.output_path:
+        with tf.io.gfile.GFile(FLAGS.output_path, 'w') as fp:
+            json.dump(results, fp, indent=4)
+        logging.info('Wrote benchmark results to {}'.format(
+            FLAGS.output_path))
+
+
+if __name__ == '__main__':
+    app.run(main)
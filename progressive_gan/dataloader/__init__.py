@@ -1,5 +1,6 @@
 from progressive_gan.dataloader.input_pipeline import InputPipeline
+from progressive_gan.dataloader.pixel_store import PixelStore
 from progressive_gan.dataloader.preprocessing_pipeline import \
     PreprocessingPipeline
 
-__all__ = ['InputPipeline', 'PreprocessingPipeline']
+__all__ = ['InputPipeline', 'PixelStore', 'PreprocessingPipeline']
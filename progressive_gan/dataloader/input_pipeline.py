@@ -1,6 +1,7 @@
 import tensorflow as tf
 from absl import logging
 
+from progressive_gan.dataloader.pixel_store import PixelStore
 from progressive_gan.dataloader.tfrecord_parser import parse_example
 
 
@@ -8,8 +9,32 @@ class InputPipeline:
 
     def __init__(self, params):
         self.tfrecord_files = params.dataloader_params.tfrecords
+        self.pixel_store = None
+        self.pixel_store_max_depth = None
+
+        pixel_store_params = params.dataloader_params.get('pixel_store')
+        if pixel_store_params:
+            self.pixel_store = PixelStore(
+                path=pixel_store_params.path,
+                gather_size=pixel_store_params.get('gather_size', 256),
+                seed=pixel_store_params.get('seed'))
+            self.pixel_store_max_depth = pixel_store_params.get(
+                'max_depth', self.pixel_store.max_depth)
+
+    def uses_pixel_store(self, depth):
+        if self.pixel_store is None or depth is None:
+            return False
+        return depth <= self.pixel_store_max_depth and \
+            self.pixel_store.has_depth(depth)
+
+    def __call__(self, input_context=None, depth=None, batch_size=None):
+        if self.uses_pixel_store(depth):
+            logging.info('Reading depth {} samples from pixel store'.format(
+                depth))
+            return self.pixel_store(depth=depth,
+                                    input_context=input_context,
+                                    batch_size=batch_size)
 
-    def __call__(self, input_context=None):
         options = tf.data.Options()
         options.experimental_deterministic = False
         autotune = tf.data.experimental.AUTOTUNE
@@ -33,4 +58,7 @@ class InputPipeline:
         dataset = dataset.map(
             map_func=parse_example,
             num_parallel_calls=autotune)
+
+        if batch_size is not None:
+            dataset = dataset.batch(batch_size, drop_remainder=True)
         return dataset
@@ -0,0 +1,92 @@
+import functools
+import json
+import os
+
+import numpy as np
+import tensorflow as tf
+from absl import logging
+
+
+class PixelStore:
+
+    def __init__(self, path, gather_size=256, seed=None):
+        self.path = path
+        self.gather_size = gather_size
+        self.seed = seed
+
+        with open(os.path.join(self.path, 'index.json'), 'r') as fp:
+            self._index = json.load(fp)
+
+        self.num_samples = self._index['num_samples']
+        self.max_resolution = self._index['max_resolution']
+        self.depths = sorted(int(depth) for depth in self._index['depths'])
+        self.min_depth = self.depths[0]
+        self.max_depth = self.depths[-1]
+
+        logging.info('Found pixel store with {} samples for depths {} in {}'
+                     .format(self.num_samples, self.depths, self.path))
+
+    def has_depth(self, depth):
+        return str(depth) in self._index['depths']
+
+    def _load_array(self, depth):
+        fname = self._index['depths'][str(depth)]['file']
+        array = np.load(os.path.join(self.path, fname), mmap_mode='r')
+        return array[:self.num_samples]
+
+    def _gather_batches(self, depth, shard_index, num_shards, batch_size,
+                        drop_remainder):
+        array = self._load_array(depth)
+        rng = np.random.default_rng(self.seed)
+
+        while True:
+            permutation = rng.permutation(self.num_samples)
+            permutation = permutation[shard_index::num_shards]
+
+            for i in range(0, len(permutation), batch_size):
+                indices = np.sort(permutation[i:i + batch_size])
+                if drop_remainder and len(indices) < batch_size:
+                    break
+                images = np.empty((len(indices), ) + array.shape[1:],
+                                  dtype=array.dtype)
+                yield np.take(array, indices, axis=0, out=images)
+
+    def __call__(self, depth, input_context=None, batch_size=None):
+        assert self.has_depth(depth), \
+            'Depth {} not found in pixel store'.format(depth)
+
+        shard_index, num_shards = 0, 1
+        if input_context is not None:
+            shard_index = input_context.input_pipeline_id
+            num_shards = input_context.num_input_pipelines
+
+        assert num_shards == 1 or self.seed is not None, \
+            'A seed shared by all input pipelines is required for sharding'
+        assert batch_size is None or \
+            batch_size <= self.num_samples // num_shards, \
+            'Batch size {} exceeds the samples in each shard'.format(
+                batch_size)
+
+        resolution = 2**depth
+        autotune = tf.data.experimental.AUTOTUNE
+
+        dataset = tf.data.Dataset.from_generator(
+            functools.partial(self._gather_batches,
+                              depth=depth,
+                              shard_index=shard_index,
+                              num_shards=num_shards,
+                              batch_size=batch_size or self.gather_size,
+                              drop_remainder=batch_size is not None),
+            output_signature=tf.TensorSpec(
+                shape=[batch_size, resolution, resolution, 3],
+                dtype=tf.uint8))
+
+        dataset = dataset.map(
+            map_func=lambda images: {
+                'image': tf.cast(images, dtype=tf.float32)
+            },
+            num_parallel_calls=autotune)
+
+        if batch_size is None:
+            dataset = dataset.unbatch()
+        return dataset.prefetch(autotune)
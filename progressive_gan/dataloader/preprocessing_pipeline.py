@@ -1,31 +1,27 @@
-import functools
-
-import numpy as np
 import tensorflow as tf
 
 
 class PreprocessingPipeline:
 
-    def __init__(self, max_resolution, current_depth):
+    def __init__(self, max_resolution, current_depth,
+                 data_format='channels_last', alpha_schedule=None):
         self.max_resolution = max_resolution
         self.current_depth = current_depth
-
-        max_depth = int(np.log2(self.max_resolution))
-
-        downscale_factor = max_depth - current_depth
-        pool_size = int(2 ** downscale_factor)
-
-        self._downscale_a = functools.partial(
-            tf.nn.avg_pool2d,
-            ksize=pool_size,
-            strides=pool_size,
-            padding='VALID')
-
-        self._downscale_b = functools.partial(
-            tf.nn.avg_pool2d,
-            ksize=pool_size * 2,
-            strides=pool_size * 2,
-            padding='VALID')
+        self.data_format = data_format
+        self.alpha_schedule = alpha_schedule
+
+    def _pool_size(self, images):
+        # Pixel store samples arrive at 2**depth with a static shape, while
+        # decoded tfrecords arrive at max_resolution with an unknown one.
+        resolution = images.shape[1] or self.max_resolution
+        return int(resolution) // 2**self.current_depth
+
+    @staticmethod
+    def _downscale(images, pool_size):
+        return tf.nn.avg_pool2d(images,
+                                ksize=pool_size,
+                                strides=pool_size,
+                                padding='VALID')
 
     def _upscale_2x(self, images):
         image_shape = tf.shape(images)
@@ -35,14 +31,24 @@ class PreprocessingPipeline:
             method='nearest')
 
     @tf.function
-    def __call__(self, sample, alpha):
+    def __call__(self, sample, alpha=None):
         images = sample["image"]
+
+        if alpha is None:
+            assert self.alpha_schedule is not None, \
+                'alpha is required when no alpha schedule is attached'
+            alpha = self.alpha_schedule.alpha
         alpha = tf.cast(alpha, dtype=tf.float32)
 
-        images_a = self._downscale_a(input=images)
-        images_b = self._upscale_2x(self._downscale_b(input=images))
+        pool_size = self._pool_size(images)
+        images_a = self._downscale(images, pool_size)
+        images_b = self._upscale_2x(self._downscale(images, pool_size * 2))
 
         images = alpha * images_a + (1 - alpha) * images_b
+
+        if self.data_format == 'channels_first':
+            images = tf.transpose(images, perm=[0, 3, 1, 2])
+
         return {
             'images': images,
         }
@@ -0,0 +1,78 @@
+import os
+from glob import glob
+from random import shuffle
+
+import tensorflow as tf
+from absl import app, flags, logging
+
+from progressive_gan.dataset_utils.pixel_store_writer import PixelStoreWriter
+
+flags.DEFINE_string('image_paths_pattern',
+                    default=None,
+                    help='File pattern matching all image names')
+
+flags.DEFINE_integer('max_resolution',
+                     default=64,
+                     help='Highest resolution stored in the pixel store')
+
+flags.DEFINE_integer('num_images',
+                     default=-1,
+                     help='Number of images to use')
+
+flags.DEFINE_string('output_dir',
+                    default='./pixel_store',
+                    help='Path to store the generated pixel arrays in.')
+
+FLAGS = flags.FLAGS
+
+
+def write_pixel_store(image_paths, max_resolution, output_dir):
+    pixel_store_writer = PixelStoreWriter(n_samples=len(image_paths),
+                                          max_resolution=max_resolution,
+                                          output_dir=output_dir)
+    bad_samples = 0
+    for image_path in image_paths:
+        try:
+            with tf.io.gfile.GFile(image_path, 'rb') as fp:
+                image = tf.image.decode_image(fp.read(), channels=3)
+        except Exception:
+            bad_samples += 1
+            continue
+
+        if image.shape[0] != max_resolution or \
+                image.shape[1] != max_resolution:
+            image = tf.image.resize(image,
+                                    size=[max_resolution, max_resolution],
+                                    method='area')
+
+        pixel_store_writer.push(image.numpy())
+    pixel_store_writer.flush()
+    logging.warning('Skipped {} corrupted samples'.format(bad_samples))
+
+
+def main(_):
+    if not os.path.exists(FLAGS.log_dir):
+        os.mkdir(FLAGS.log_dir)
+
+    logging.get_absl_handler().use_absl_log_file('create_pixel_store')
+
+    if not os.path.exists(FLAGS.output_dir):
+        os.mkdir(FLAGS.output_dir)
+
+    image_paths = sorted(glob(FLAGS.image_paths_pattern))
+
+    logging.info('Found {} matching images with the pattern: {}'.format(
+        len(image_paths), FLAGS.image_paths_pattern))
+
+    shuffle(image_paths)
+
+    if FLAGS.num_images != -1:
+        image_paths = image_paths[:FLAGS.num_images]
+        logging.info('Using {} images from {} total images'.format(
+            FLAGS.num_images, len(image_paths)))
+
+    write_pixel_store(image_paths, FLAGS.max_resolution, FLAGS.output_dir)
+
+
+if __name__ == '__main__':
+    app.run(main)
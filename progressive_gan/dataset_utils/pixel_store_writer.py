@@ -0,0 +1,74 @@
+import json
+import os
+
+import numpy as np
+from absl import logging
+
+
+class PixelStoreWriter:
+    def __init__(self, n_samples, max_resolution, output_dir=''):
+        self.n_samples = n_samples
+        self.max_resolution = max_resolution
+        self.output_dir = output_dir
+        self.min_depth = 2
+        self.max_depth = int(np.log2(max_resolution))
+        self._count = 0
+        self._arrays = {}
+
+        for depth in range(self.min_depth, self.max_depth + 1):
+            resolution = 2**depth
+            array_path = os.path.join(self.output_dir,
+                                      PixelStoreWriter._fname(depth))
+            logging.info('Allocating {}x{} pixel array for {} samples in {}'
+                         .format(resolution, resolution, n_samples,
+                                 array_path))
+            self._arrays[depth] = np.lib.format.open_memmap(
+                array_path,
+                mode='w+',
+                dtype=np.uint8,
+                shape=(n_samples, resolution, resolution, 3))
+
+    @staticmethod
+    def _fname(depth):
+        return 'depth-{:02d}.npy'.format(depth)
+
+    @staticmethod
+    def _downscale_2x(image):
+        h, w, c = image.shape
+        return image.reshape(h // 2, 2, w // 2, 2, c).mean(axis=(1, 3))
+
+    def push(self, image):
+        assert image.shape == (self.max_resolution, self.max_resolution, 3), \
+            'Expected image of shape {}, got {}'.format(
+                (self.max_resolution, self.max_resolution, 3), image.shape)
+        assert self._count < self.n_samples, 'Pixel store is full'
+
+        image = image.astype(np.float32)
+        for depth in range(self.max_depth, self.min_depth - 1, -1):
+            self._arrays[depth][self._count] = \
+                np.clip(np.round(image), 0, 255).astype(np.uint8)
+            image = PixelStoreWriter._downscale_2x(image)
+        self._count += 1
+
+    def flush(self):
+        index = {
+            'num_samples': self._count,
+            'max_resolution': self.max_resolution,
+            'depths': {}
+        }
+        for depth, array in self._arrays.items():
+            array.flush()
+            index['depths'][str(depth)] = {
+                'file': PixelStoreWriter._fname(depth),
+                'shape': [self.n_samples, 2**depth, 2**depth, 3]
+            }
+
+        if self._count != self.n_samples:
+            logging.warning(
+                'Wrote {} samples into arrays allocated for {} samples'.format(
+                    self._count, self.n_samples))
+
+        index_path = os.path.join(self.output_dir, 'index.json')
+        logging.info('Writing pixel store index to {}'.format(index_path))
+        with open(index_path, 'w') as fp:
+            json.dump(index, fp, indent=4)
@@ -0,0 +1,4 @@
+from progressive_gan.evaluation.fid import (FeatureExtractor, FIDEvaluator,
+                                            frechet_distance)
+
+__all__ = ['FeatureExtractor', 'FIDEvaluator', 'frechet_distance']
@@ -0,0 +1,224 @@
+import hashlib
+import os
+
+import numpy as np
+import tensorflow as tf
+from absl import logging
+
+from progressive_gan.dataloader import InputPipeline, PreprocessingPipeline
+
+
+def frechet_distance(mu_a, sigma_a, mu_b, sigma_b):
+    eigenvalues, eigenvectors = np.linalg.eigh(sigma_a)
+    sqrt_sigma_a = (eigenvectors * np.sqrt(np.clip(eigenvalues, 0, None))) \
+        @ eigenvectors.T
+
+    product = sqrt_sigma_a @ sigma_b @ sqrt_sigma_a
+    product = (product + product.T) / 2
+    trace_sqrt_product = np.sum(
+        np.sqrt(np.clip(np.linalg.eigvalsh(product), 0, None)))
+
+    diff = mu_a - mu_b
+    return float(diff @ diff + np.trace(sigma_a) + np.trace(sigma_b) -
+                 2 * trace_sqrt_product)
+
+
+class _RunningStatistics:
+
+    def __init__(self):
+        self.count = 0
+        self._sum = None
+        self._sum_outer = None
+
+    def update(self, features):
+        features = features.astype(np.float64)
+        if self._sum is None:
+            self._sum = np.zeros(features.shape[1], dtype=np.float64)
+            self._sum_outer = np.zeros(
+                (features.shape[1], features.shape[1]), dtype=np.float64)
+
+        self.count += features.shape[0]
+        self._sum += features.sum(axis=0)
+        self._sum_outer += features.T @ features
+
+    def finalize(self):
+        mu = self._sum / self.count
+        sigma = (self._sum_outer - self.count * np.outer(mu, mu)) / \
+            (self.count - 1)
+        return mu, sigma
+
+
+class FeatureExtractor:
+
+    def __init__(self, saved_model_path, input_size=299,
+                 signature='serving_default'):
+        self.saved_model_path = saved_model_path
+        self.input_size = input_size
+        self.signature = signature
+
+        logging.info('Loading feature network from {}'.format(
+            saved_model_path))
+        self._model = tf.saved_model.load(saved_model_path)
+
+        if signature:
+            self._fn = self._model.signatures[signature]
+            self._input_name = \
+                list(self._fn.structured_input_signature[1].keys())[0]
+        else:
+            self._fn = self._model
+            self._input_name = None
+
+    @property
+    def identity(self):
+        identity = hashlib.sha256('{}:{}:{}\n'.format(
+            os.path.abspath(self.saved_model_path), self.input_size,
+            self.signature).encode())
+
+        saved_model_pb = os.path.join(self.saved_model_path,
+                                      'saved_model.pb')
+        if tf.io.gfile.exists(saved_model_pb):
+            with tf.io.gfile.GFile(saved_model_pb, 'rb') as fp:
+                identity.update(fp.read())
+        return identity.hexdigest()
+
+    def __call__(self, images):
+        images = tf.image.resize(images,
+                                 size=[self.input_size, self.input_size],
+                                 method='bilinear')
+        images = images / 127.5 - 1.0
+
+        if self._input_name is None:
+            features = self._fn(images)
+        else:
+            features = self._fn(**{self._input_name: images})
+
+        if isinstance(features, dict):
+            features = list(features.values())[0]
+        return tf.reshape(features, [tf.shape(features)[0], -1])
+
+
+class FIDEvaluator:
+
+    def __init__(self, params, generator, feature_extractor=None):
+        self.params = params
+        self.generator = generator
+
+        evaluation_params = params.evaluation_params
+        self.num_samples = evaluation_params.get('num_samples', 10000)
+        self.batch_size = evaluation_params.get('batch_size', 64)
+        self.latent_dim = evaluation_params.get('latent_dim', 512)
+        self.cache_dir = evaluation_params.get('cache_dir', './fid_cache')
+
+        if feature_extractor is None:
+            feature_extractor = FeatureExtractor(
+                saved_model_path=evaluation_params.saved_model_path,
+                input_size=evaluation_params.get('input_size', 299),
+                signature=evaluation_params.get('signature',
+                                                'serving_default'))
+        self.feature_extractor = feature_extractor
+
+        self._num_batches = -(-self.num_samples // self.batch_size)
+        self._manifest_hash = None
+        self._feature_extractor_hash = None
+        self._generate_fns = {}
+
+    @property
+    def manifest_hash(self):
+        if self._manifest_hash is None:
+            tfrecord_files = sorted(
+                tf.io.gfile.glob(self.params.dataloader_params.tfrecords))
+            manifest = hashlib.sha256()
+            for tfrecord_file in tfrecord_files:
+                manifest.update('{}:{}\n'.format(
+                    os.path.basename(tfrecord_file),
+                    tf.io.gfile.stat(tfrecord_file).length).encode())
+            self._manifest_hash = manifest.hexdigest()
+        return self._manifest_hash
+
+    @property
+    def feature_extractor_hash(self):
+        if self._feature_extractor_hash is None:
+            self._feature_extractor_hash = getattr(
+                self.feature_extractor, 'identity',
+                type(self.feature_extractor).__name__)
+        return self._feature_extractor_hash
+
+    def _cache_path(self, depth):
+        resolution = 2**depth
+        fname = '{}-{}-{}x{}-{}.npz'.format(self.manifest_hash[:16],
+                                            self.feature_extractor_hash[:16],
+                                            resolution, resolution,
+                                            self.num_samples)
+        return os.path.join(self.cache_dir, fname)
+
+    def _compute_real_statistics(self, depth):
+        preprocessing_pipeline = PreprocessingPipeline(
+            max_resolution=self.generator.max_resolution,
+            current_depth=depth)
+
+        dataset = InputPipeline(self.params)()
+        dataset = dataset.batch(self.batch_size, drop_remainder=True)
+        dataset = dataset.map(
+            map_func=lambda sample: preprocessing_pipeline(sample, 1.0),
+            num_parallel_calls=tf.data.experimental.AUTOTUNE)
+        dataset = dataset.take(self._num_batches)
+        dataset = dataset.prefetch(tf.data.experimental.AUTOTUNE)
+
+        extract_fn = tf.function(self.feature_extractor.__call__)
+        statistics = _RunningStatistics()
+        for sample in dataset:
+            statistics.update(extract_fn(sample['images']).numpy())
+        return statistics.finalize()
+
+    def real_statistics(self, depth):
+        cache_path = self._cache_path(depth)
+        if os.path.exists(cache_path):
+            logging.info('Loading cached real statistics from {}'.format(
+                cache_path))
+            with np.load(cache_path) as statistics:
+                return statistics['mu'], statistics['sigma']
+
+        logging.info('Computing real statistics at depth {}'.format(depth))
+        mu, sigma = self._compute_real_statistics(depth)
+
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        np.savez(cache_path, mu=mu, sigma=sigma)
+        logging.info('Cached real statistics in {}'.format(cache_path))
+        return mu, sigma
+
+    def _generate_fn(self, depth):
+        if depth not in self._generate_fns:
+
+            @tf.function
+            def generate_features(noise):
+                images = self.generator((noise, tf.constant(1.0)))
+                if self.generator.data_format == 'channels_first':
+                    images = tf.transpose(images, perm=[0, 2, 3, 1])
+                images = tf.clip_by_value(images, 0.0, 255.0)
+                return self.feature_extractor(images)
+
+            self._generate_fns[depth] = generate_features
+        return self._generate_fns[depth]
+
+    def fake_statistics(self, depth):
+        generate_fn = self._generate_fn(depth)
+        statistics = _RunningStatistics()
+        for _ in range(self._num_batches):
+            noise = tf.random.normal([self.batch_size, self.latent_dim])
+            statistics.update(generate_fn(noise).numpy())
+        return statistics.finalize()
+
+    def __call__(self, depth=None):
+        if depth is None:
+            depth = self.generator.current_depth
+        assert depth == self.generator.current_depth, \
+            'Generator is at depth {}, cannot evaluate depth {}'.format(
+                self.generator.current_depth, depth)
+
+        mu_real, sigma_real = self.real_statistics(depth)
+        mu_fake, sigma_fake = self.fake_statistics(depth)
+
+        fid = frechet_distance(mu_real, sigma_real, mu_fake, sigma_fake)
+        logging.info('FID at depth {}: {:.4f}'.format(depth, fid))
+        return fid
@@ -0,0 +1,3 @@
+from progressive_gan.export.quantization import GeneratorQuantizer
+
+__all__ = ['GeneratorQuantizer']
@@ -0,0 +1,178 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+import tensorflow as tf
+from absl import logging
+
+from progressive_gan.model import Generator
+from progressive_gan.model.layers import EqualizedConv2d, EqualizedDense
+
+
+class GeneratorQuantizer:
+
+    _MODES = ['dynamic_range', 'int8']
+
+    def __init__(self,
+                 generator,
+                 latent_dim=512,
+                 mode='dynamic_range',
+                 num_calibration_samples=256,
+                 float_node_patterns=('pixel-norm',),
+                 seed=0):
+        assert mode in GeneratorQuantizer._MODES, \
+            'mode should be one of {}'.format(GeneratorQuantizer._MODES)
+
+        self.generator = generator
+        self.latent_dim = latent_dim
+        self.mode = mode
+        self.num_calibration_samples = num_calibration_samples
+        self.float_node_patterns = float_node_patterns
+        self.seed = seed
+
+        self._export_generator = self._folded_copy()
+        self._concrete_fn = self._make_concrete_fn()
+
+    def _folded_copy(self):
+        generator = Generator(
+            max_resolution=self.generator.max_resolution,
+            use_equalized_layers=self.generator.use_equalized_layers)
+
+        generator.assign_depth(self.generator.current_depth)
+        generator((tf.zeros([1, self.latent_dim]), tf.constant(1.0)))
+
+        with tempfile.TemporaryDirectory() as checkpoint_dir:
+            path = tf.train.Checkpoint(generator=self.generator).write(
+                os.path.join(checkpoint_dir, 'ckpt'))
+            status = tf.train.Checkpoint(generator=generator).restore(path)
+            status.assert_existing_objects_matched().expect_partial()
+
+        for layer in generator.submodules:
+            if isinstance(layer, (EqualizedConv2d, EqualizedDense)):
+                layer.fold_scale()
+        return generator
+
+    def _make_concrete_fn(self):
+
+        @tf.function(input_signature=[
+            tf.TensorSpec([1, self.latent_dim], dtype=tf.float32)
+        ])
+        def generate(noise):
+            return self._export_generator((noise, tf.constant(1.0)))
+
+        return generate.get_concrete_function()
+
+    def _latents(self, num_samples, seed):
+        return tf.random.stateless_normal([num_samples, 1, self.latent_dim],
+                                          seed=[seed, 0])
+
+    def _representative_dataset(self):
+        for noise in self._latents(self.num_calibration_samples, self.seed):
+            yield [noise]
+
+    def _converter(self):
+        return tf.lite.TFLiteConverter.from_concrete_functions(
+            [self._concrete_fn])
+
+    def convert_float(self):
+        return self._converter().convert()
+
+    def _float_node_names(self):
+        interpreter = tf.lite.Interpreter(model_content=self.convert_float())
+        return [
+            tensor['name'] for tensor in interpreter.get_tensor_details()
+            if any(pattern in tensor['name']
+                   for pattern in self.float_node_patterns)
+        ]
+
+    def convert(self):
+        converter = self._converter()
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+        if self.mode == 'dynamic_range':
+            logging.info('Converting generator with dynamic range '
+                         'quantization')
+            return converter.convert()
+
+        logging.info('Converting generator with int8 quantization using {} '
+                     'calibration latents'.format(
+                         self.num_calibration_samples))
+        converter.representative_dataset = self._representative_dataset
+        converter.target_spec.supported_ops = [
+            tf.lite.OpsSet.TFLITE_BUILTINS_INT8, tf.lite.OpsSet.TFLITE_BUILTINS
+        ]
+
+        if not hasattr(tf.lite.experimental, 'QuantizationDebugOptions'):
+            logging.warning('Selective quantization is unavailable, '
+                            'quantizing {} nodes to int8'.format(
+                                self.float_node_patterns))
+            return converter.convert()
+
+        float_node_names = self._float_node_names()
+        logging.info('Keeping {} nodes matching {} in float'.format(
+            len(float_node_names), self.float_node_patterns))
+        debugger = tf.lite.experimental.QuantizationDebugger(
+            converter=converter,
+            debug_dataset=self._representative_dataset,
+            debug_options=tf.lite.experimental.QuantizationDebugOptions(
+                denylisted_nodes=float_node_names))
+        return debugger.get_nondebug_quantized_model()
+
+    @staticmethod
+    def _run_interpreter(tflite_model, latents, num_threads):
+        interpreter = tf.lite.Interpreter(model_content=tflite_model,
+                                          num_threads=num_threads)
+        interpreter.allocate_tensors()
+        input_index = interpreter.get_input_details()[0]['index']
+        output_index = interpreter.get_output_details()[0]['index']
+
+        outputs = []
+        latencies = []
+        for noise in latents:
+            interpreter.set_tensor(input_index, noise.numpy())
+            start = time.perf_counter()
+            interpreter.invoke()
+            latencies.append(time.perf_counter() - start)
+            outputs.append(interpreter.get_tensor(output_index))
+        return np.concatenate(outputs, axis=0), np.array(latencies)
+
+    def report(self,
+               tflite_model,
+               num_samples=64,
+               num_threads=None,
+               feature_extractor=None):
+        latents = self._latents(num_samples, self.seed + 1)
+        reference = np.concatenate(
+            [self._concrete_fn(noise).numpy() for noise in latents], axis=0)
+
+        report = {}
+        models = {'float': self.convert_float(), self.mode: tflite_model}
+        for name, model in models.items():
+            outputs, latencies = GeneratorQuantizer._run_interpreter(
+                model, latents, num_threads)
+            error = outputs - reference
+            mse = float(np.mean(np.square(error)))
+
+            report[name] = {
+                'model_size_bytes': len(model),
+                'latency_ms_mean': float(np.mean(latencies) * 1e3),
+                'latency_ms_p50': float(np.percentile(latencies, 50) * 1e3),
+                'latency_ms_p90': float(np.percentile(latencies, 90) * 1e3),
+                'pixel_mse': mse,
+                'pixel_max_abs_error': float(np.max(np.abs(error))),
+                'pixel_psnr': float(10 * np.log10(255.0**2 / mse))
+                if mse > 0 else float('inf')
+            }
+
+            if feature_extractor is not None:
+                features = feature_extractor(
+                    tf.clip_by_value(outputs, 0.0, 255.0)).numpy()
+                reference_features = feature_extractor(
+                    tf.clip_by_value(reference, 0.0, 255.0)).numpy()
+                report[name]['feature_l2_error'] = float(
+                    np.mean(np.linalg.norm(features - reference_features,
+                                           axis=-1)))
+
+            logging.info('{}: {}'.format(name, report[name]))
+        return report
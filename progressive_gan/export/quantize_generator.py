@@ -0,0 +1,103 @@
+import json
+import os
+
+import tensorflow as tf
+from absl import app, flags, logging
+
+from progressive_gan.cfg import Config
+from progressive_gan.evaluation import FeatureExtractor
+from progressive_gan.export.quantization import GeneratorQuantizer
+from progressive_gan.model import Generator
+
+flags.DEFINE_string('config_path',
+                    default=None,
+                    help='Path to the training config')
+
+flags.DEFINE_string('checkpoint',
+                    default=None,
+                    help='Checkpoint to restore the generator from')
+
+flags.DEFINE_integer('depth',
+                     default=None,
+                     help='Depth to export, defaults to the checkpoint depth')
+
+flags.DEFINE_enum('mode',
+                  default='dynamic_range',
+                  enum_values=['dynamic_range', 'int8'],
+                  help='Quantization mode')
+
+flags.DEFINE_integer('latent_dim',
+                     default=512,
+                     help='Size of the generator latent vector')
+
+flags.DEFINE_integer('num_calibration_samples',
+                     default=256,
+                     help='Number of latents used for int8 calibration')
+
+flags.DEFINE_integer('num_eval_samples',
+                     default=64,
+                     help='Number of latents used for the error report')
+
+flags.DEFINE_integer('num_threads',
+                     default=None,
+                     help='Number of CPU threads used by the interpreter')
+
+flags.DEFINE_string('feature_saved_model',
+                    default=None,
+                    help='Optional feature network for feature level error')
+
+flags.DEFINE_string('output_dir',
+                    default='./export',
+                    help='Path to store the quantized model and report in.')
+
+FLAGS = flags.FLAGS
+
+
+def main(_):
+    if not os.path.exists(FLAGS.output_dir):
+        os.makedirs(FLAGS.output_dir)
+
+    params = Config(FLAGS.config_path).params
+    generator = Generator(
+        max_resolution=params.model_params.max_resolution,
+        use_equalized_layers=params.model_params.use_equalized_layers)
+
+    tf.train.Checkpoint(generator=generator).restore(
+        FLAGS.checkpoint).expect_partial()
+    generator.restore_current_depth()
+    if FLAGS.depth is not None:
+        generator.assign_depth(FLAGS.depth)
+    generator((tf.zeros([1, FLAGS.latent_dim]), tf.constant(1.0)))
+
+    quantizer = GeneratorQuantizer(
+        generator=generator,
+        latent_dim=FLAGS.latent_dim,
+        mode=FLAGS.mode,
+        num_calibration_samples=FLAGS.num_calibration_samples)
+    tflite_model = quantizer.convert()
+
+    model_path = os.path.join(
+        FLAGS.output_dir, 'generator-depth-{}-{}.tflite'.format(
+            generator.current_depth, FLAGS.mode))
+    with tf.io.gfile.GFile(model_path, 'wb') as fp:
+        fp.write(tflite_model)
+    logging.info('Wrote quantized generator to {}'.format(model_path))
+
+    feature_extractor = None
+    if FLAGS.feature_saved_model:
+        feature_extractor = FeatureExtractor(FLAGS.feature_saved_model)
+
+    report = quantizer.report(tflite_model,
+                              num_samples=FLAGS.num_eval_samples,
+                              num_threads=FLAGS.num_threads,
+                              feature_extractor=feature_extractor)
+
+    report_path = os.path.splitext(model_path)[0] + '-report.json'
+    with tf.io.gfile.GFile(report_path, 'w') as fp:
+        json.dump(report, fp, indent=4)
+    logging.info('Wrote quantization report to {}'.format(report_path))
+
+
+if __name__ == '__main__':
+    flags.mark_flags_as_required(['config_path', 'checkpoint'])
+    app.run(main)
@@ -1,10 +1,12 @@
 from progressive_gan.model.modules.modules_impl import (
     DiscriminatorDownsampleBlock, DiscriminatorFinalBlock, FromRGBBlock,
     GeneratorBaseBlock, GeneratorUpsampleBlock, ToRGBBlock)
+from progressive_gan.model.networks.alpha_schedule import AlphaSchedule
 from progressive_gan.model.networks.base_network import BaseNetwork
 from progressive_gan.model.networks.networks import Discriminator, Generator
 
 __all__ = [
+    'AlphaSchedule',
     'BaseNetwork',
     'Discriminator',
     'DiscriminatorDownsampleBlock',
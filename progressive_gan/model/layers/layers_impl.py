@@ -5,54 +5,145 @@ from tensorflow.python.ops.nn_ops import conv2d
 
 class EqualizedConv2d(tf.keras.layers.Conv2D):
 
-    def __init__(self, **kwargs):
+    def __init__(self, num_models=1, **kwargs):
         super(EqualizedConv2d,
               self).__init__(activation=None,
                              kernel_initializer=tf.initializers.RandomNormal(
                                  0, 1),
                              bias_initializer='zeros',
                              **kwargs)
+        self.num_models = num_models
+
+        if num_models > 1:
+            assert self.data_format == 'channels_last', \
+                'Stacked models only support channels_last'
+            assert tuple(self.strides) == (1, 1) and \
+                tuple(self.dilation_rate) == (1, 1), \
+                'Stacked models only support unit strides and dilations'
 
     def build(self, input_shape):
         in_channels = self._get_input_channel(input_shape)
         self.scale = tf.sqrt(
             2 / (self.kernel_size[0] * self.kernel_size[1] * in_channels))
-        super(EqualizedConv2d, self).build(input_shape)
+
+        if self.num_models == 1:
+            super(EqualizedConv2d, self).build(input_shape)
+            return
+
+        self.kernel = self.add_weight(
+            name='kernel',
+            shape=[self.num_models, *self.kernel_size, in_channels,
+                   self.filters],
+            initializer=self.kernel_initializer,
+            trainable=True,
+            dtype=self.dtype)
+
+        self.bias = None
+        if self.use_bias:
+            self.bias = self.add_weight(name='bias',
+                                        shape=[self.num_models, self.filters],
+                                        initializer=self.bias_initializer,
+                                        trainable=True,
+                                        dtype=self.dtype)
+        self.built = True
+
+    def _stacked_call(self, x):
+        patches = tf.image.extract_patches(
+            x,
+            sizes=[1, self.kernel_size[0], self.kernel_size[1], 1],
+            strides=[1, 1, 1, 1],
+            rates=[1, 1, 1, 1],
+            padding=self.padding.upper())
+        patches_shape = tf.shape(patches)
+
+        kernel = tf.reshape(self.kernel * self.scale,
+                            [self.num_models, -1, self.filters])
+        y = tf.matmul(
+            tf.reshape(patches, [self.num_models, -1, patches_shape[-1]]),
+            kernel)
+
+        if self.use_bias:
+            y = y + self.bias[:, tf.newaxis, :]
+        return tf.reshape(y, tf.concat([patches_shape[:-1], [self.filters]],
+                                       axis=0))
 
     def call(self, x):
+        if self.num_models > 1:
+            return self._stacked_call(x)
+
+        data_format = \
+            'NCHW' if self.data_format == 'channels_first' else 'NHWC'
         x = conv2d(input=x,
                    filters=self.kernel * self.scale,
                    strides=self.strides,
                    padding=self.padding.upper(),
+                   data_format=data_format,
                    dilations=self.dilation_rate)
 
         if self.use_bias:
-            x = tf.nn.bias_add(x, self.bias)
+            x = tf.nn.bias_add(x, self.bias, data_format=data_format)
         return x
 
+    def fold_scale(self):
+        self.kernel.assign(self.kernel * self.scale)
+        self.scale = tf.constant(1.0)
+
     def get_config(self):
         super(EqualizedConv2d, self).get_config()
 
 
 class EqualizedDense(tf.keras.layers.Dense):
 
-    def __init__(self, **kwargs):
+    def __init__(self, num_models=1, **kwargs):
         super(EqualizedDense,
               self).__init__(activation=None,
                              kernel_initializer=tf.initializers.RandomNormal(
                                  0, 1),
                              bias_initializer='zeros',
                              **kwargs)
+        self.num_models = num_models
 
     def build(self, input_shape):
         in_features = tf.TensorShape(input_shape).as_list()[-1]
         self.scale = tf.sqrt(2 / in_features)
-        super(EqualizedDense, self).build(input_shape)
+
+        if self.num_models == 1:
+            super(EqualizedDense, self).build(input_shape)
+            return
+
+        self.kernel = self.add_weight(
+            name='kernel',
+            shape=[self.num_models, in_features, self.units],
+            initializer=self.kernel_initializer,
+            trainable=True,
+            dtype=self.dtype)
+
+        self.bias = None
+        if self.use_bias:
+            self.bias = self.add_weight(name='bias',
+                                        shape=[self.num_models, self.units],
+                                        initializer=self.bias_initializer,
+                                        trainable=True,
+                                        dtype=self.dtype)
+        self.built = True
+
+    def _stacked_call(self, x):
+        input_shape = tf.shape(x)
+        y = tf.matmul(tf.reshape(x, [self.num_models, -1, input_shape[-1]]),
+                      self.kernel * self.scale)
+
+        if self.use_bias:
+            y = y + self.bias[:, tf.newaxis, :]
+        return tf.reshape(y, tf.concat([input_shape[:-1], [self.units]],
+                                       axis=0))
 
     def call(self, x):
+        if self.num_models > 1:
+            return self._stacked_call(x)
+
         x = dense(inputs=x,
                   kernel=self.kernel * self.scale,
-                  bias=self.bias,
+                  bias=None,
                   activation=self.activation,
                   dtype=self._compute_dtype_object)
 
@@ -60,50 +151,87 @@ class EqualizedDense(tf.keras.layers.Dense):
             x = tf.nn.bias_add(x, self.bias)
         return x
 
+    def fold_scale(self):
+        self.kernel.assign(self.kernel * self.scale)
+        self.scale = tf.constant(1.0)
+
     def get_config(self):
         super(EqualizedDense, self).get_config()
 
 
 class PixelwiseNorm(tf.keras.layers.Layer):
 
-    def __init__(self, **kwargs):
+    def __init__(self, data_format='channels_last', **kwargs):
         super(PixelwiseNorm, self).__init__(**kwargs)
+        self.data_format = data_format
+        self._channel_axis = 1 if data_format == 'channels_first' else -1
 
     def call(self, x):
         return x * tf.math.rsqrt(
-            tf.reduce_mean(tf.square(x), axis=-1, keepdims=True) +
+            tf.reduce_mean(
+                tf.square(x), axis=self._channel_axis, keepdims=True) +
             tf.keras.backend.epsilon())
 
     def get_config(self):
-        super(PixelwiseNorm, self).get_config()
+        config = {'data_format': self.data_format}
+        base_config = super(PixelwiseNorm, self).get_config()
+        return dict(list(base_config.items()) + list(config.items()))
 
 
 class MiniBatchStandardDeviation(tf.keras.layers.Layer):
 
-    def __init__(self, group_size=4, **kwargs):
+    def __init__(self,
+                 group_size=4,
+                 data_format='channels_last',
+                 num_models=1,
+                 **kwargs):
         super(MiniBatchStandardDeviation, self).__init__(**kwargs)
         self.group_size = group_size
+        self.data_format = data_format
+        self.num_models = num_models
 
     def call(self, x):
         input_shape = tf.shape(x)
-        N = input_shape[0]
-        H = input_shape[1]
-        W = input_shape[2]
-        C = input_shape[3]
+        K = self.num_models
+        N = input_shape[0] // K
+        if self.data_format == 'channels_first':
+            C = input_shape[1]
+            H = input_shape[2]
+            W = input_shape[3]
+        else:
+            H = input_shape[1]
+            W = input_shape[2]
+            C = input_shape[3]
         group_size = tf.minimum(N, self.group_size)
 
-        y = tf.reshape(x, shape=[group_size, N // group_size, H, W, C])
+        if self.data_format == 'channels_first':
+            y = tf.reshape(x,
+                           shape=[K, group_size, N // group_size, C, H, W])
+        else:
+            y = tf.reshape(x,
+                           shape=[K, group_size, N // group_size, H, W, C])
 
         y = tf.cast(y, dtype=tf.float32)
-        y = y - tf.reduce_mean(y, axis=0)
+        y = y - tf.reduce_mean(y, axis=1, keepdims=True)
         y = tf.sqrt(
-            tf.reduce_mean(tf.square(y), axis=0) + tf.keras.backend.epsilon())
-        y = tf.reduce_mean(y, axis=[1, 2, 3], keepdims=True)
-        y = tf.cast(y, dtype=x.dtype)
-        y = tf.tile(y, multiples=[group_size, H, W, 1])
+            tf.reduce_mean(tf.square(y), axis=1) + tf.keras.backend.epsilon())
+        y = tf.reduce_mean(y, axis=[2, 3, 4], keepdims=True)
+        y = tf.cast(y[:, tf.newaxis], dtype=x.dtype)
+
+        if self.data_format == 'channels_first':
+            y = tf.tile(y, multiples=[1, group_size, 1, 1, H, W])
+            y = tf.reshape(y, shape=[-1, 1, H, W])
+            return tf.concat([x, y], axis=1)
+
+        y = tf.tile(y, multiples=[1, group_size, 1, H, W, 1])
+        y = tf.reshape(y, shape=[-1, H, W, 1])
         return tf.concat([x, y], axis=-1)
 
     def get_config(self):
-        config = {'group_size': self.group_size}
+        config = {
+            'group_size': self.group_size,
+            'data_format': self.data_format,
+            'num_models': self.num_models
+        }
         base_config = super(MiniBatchStandardDeviation, self).get_config()
         return dict(list(base_config.items()) + list(config.items()))
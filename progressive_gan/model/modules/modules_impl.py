@@ -1,3 +1,5 @@
+import functools
+
 import tensorflow as tf
 
 from progressive_gan.model.layers import (EqualizedConv2d, EqualizedDense,
@@ -5,20 +7,41 @@ from progressive_gan.model.layers import (EqualizedConv2d, EqualizedDense,
                                           PixelwiseNorm)
 
 
+def _conv_layer(use_equalized_layers, num_models):
+    if use_equalized_layers:
+        return functools.partial(EqualizedConv2d, num_models=num_models)
+    assert num_models == 1, 'Stacked models require equalized layers'
+    return tf.keras.layers.Conv2D
+
+
+def _dense_layer(use_equalized_layers, num_models):
+    if use_equalized_layers:
+        return functools.partial(EqualizedDense, num_models=num_models)
+    assert num_models == 1, 'Stacked models require equalized layers'
+    return tf.keras.layers.Dense
+
+
 class GeneratorBaseBlock(tf.keras.layers.Layer):
 
-    def __init__(self, filters, use_equalized_layers=True, **kwargs):
+    def __init__(self,
+                 filters,
+                 use_equalized_layers=True,
+                 data_format='channels_last',
+                 num_models=1,
+                 **kwargs):
         super(GeneratorBaseBlock, self).__init__(**kwargs)
 
         self.filters = filters
         self.use_equalized_layers = use_equalized_layers
+        self.data_format = data_format
+        self.num_models = num_models
 
-        dense_layer = \
-            EqualizedDense if use_equalized_layers else tf.keras.layers.Dense
-        conv_layer = \
-            EqualizedConv2d if use_equalized_layers else tf.keras.layers.Conv2D
+        dense_layer = _dense_layer(use_equalized_layers, num_models)
+        conv_layer = _conv_layer(use_equalized_layers, num_models)
 
-        self.pixel_norm = PixelwiseNorm(name='{}-pixel-norm'.format(self.name))
+        self.pixel_norm = PixelwiseNorm(
+            data_format=data_format,
+            name='{}-pixel-norm'.format(self.name))
 
         self.leaky_relu = tf.keras.layers.LeakyReLU(
             alpha=0.2,
@@ -32,13 +55,15 @@ class GeneratorBaseBlock(tf.keras.layers.Layer):
             filters=filters,
             kernel_size=3,
             padding='same',
+            data_format=data_format,
             name='{}-conv-3x3'.format(self.name))
 
     def call(self, x):
-        y = tf.expand_dims(tf.expand_dims(x, axis=1), axis=1)
-        y = self.pixel_norm(y)
+        y = self.pixel_norm(x)
         y = self.leaky_relu(self.dense(y))
         y = tf.reshape(y, [-1, 4, 4, self.filters])
+        if self.data_format == 'channels_first':
+            y = tf.transpose(y, perm=[0, 3, 1, 2])
         y = self.leaky_relu(self.conv(y))
         y = self.pixel_norm(y)
         return y
@@ -46,7 +71,9 @@ class GeneratorBaseBlock(tf.keras.layers.Layer):
     def get_config(self):
         config = {
             'filters': self.filters,
-            'use_equalized_layers': self.use_equalized_layers
+            'use_equalized_layers': self.use_equalized_layers,
+            'data_format': self.data_format,
+            'num_models': self.num_models
         }
         base_config = super(GeneratorBaseBlock, self).get_config()
         return dict(list(base_config.items()) + list(config.items()))
@@ -54,16 +81,24 @@ class GeneratorBaseBlock(tf.keras.layers.Layer):
 
 class GeneratorUpsampleBlock(tf.keras.layers.Layer):
 
-    def __init__(self, filters, use_equalized_layers=True, **kwargs):
+    def __init__(self,
+                 filters,
+                 use_equalized_layers=True,
+                 data_format='channels_last',
+                 num_models=1,
+                 **kwargs):
         super(GeneratorUpsampleBlock, self).__init__(**kwargs)
 
         self.filters = filters
         self.use_equalized_layers = use_equalized_layers
+        self.data_format = data_format
+        self.num_models = num_models
 
-        conv_layer = \
-            EqualizedConv2d if use_equalized_layers else tf.keras.layers.Conv2D
+        conv_layer = _conv_layer(use_equalized_layers, num_models)
 
-        self.pixel_norm = PixelwiseNorm(name='{}-pixel-norm'.format(self.name))
+        self.pixel_norm = PixelwiseNorm(
+            data_format=data_format,
+            name='{}-pixel-norm'.format(self.name))
 
         self.leaky_relu = tf.keras.layers.LeakyReLU(
             alpha=0.2,
@@ -72,16 +107,19 @@ class GeneratorUpsampleBlock(tf.keras.layers.Layer):
         self.conv_1 = conv_layer(
             filters=filters, kernel_size=3,
             padding='same',
+            data_format=data_format,
             name='{}-conv-3x3-1'.format(self.name))
 
         self.conv_2 = conv_layer(
             filters=filters, kernel_size=3,
             padding='same',
+            data_format=data_format,
             name='{}-conv-3x3-2'.format(self.name))
 
         self.upscale_2x = tf.keras.layers.UpSampling2D(
             size=2,
             interpolation='nearest',
+            data_format=data_format,
             name='{}-nearest-2x-upsampling'.format(self.name))
 
     def call(self, x):
@@ -93,7 +131,9 @@ class GeneratorUpsampleBlock(tf.keras.layers.Layer):
     def get_config(self):
         config = {
             'filters': self.filters,
-            'use_equalized_layers': self.use_equalized_layers
+            'use_equalized_layers': self.use_equalized_layers,
+            'data_format': self.data_format,
+            'num_models': self.num_models
         }
         base_config = super(GeneratorUpsampleBlock, self).get_config()
         return dict(list(base_config.items()) + list(config.items()))
@@ -101,31 +141,46 @@ class GeneratorUpsampleBlock(tf.keras.layers.Layer):
 
 class ToRGBBlock(tf.keras.layers.Layer):
 
-    def __init__(self, use_equalized_layers=True, **kwargs):
+    def __init__(self,
+                 use_equalized_layers=True,
+                 data_format='channels_last',
+                 num_models=1,
+                 **kwargs):
         super(ToRGBBlock, self).__init__(**kwargs)
 
         self.use_equalized_layers = use_equalized_layers
+        self.data_format = data_format
+        self.num_models = num_models
 
-        conv_layer = \
-            EqualizedConv2d if use_equalized_layers else tf.keras.layers.Conv2D
+        conv_layer = _conv_layer(use_equalized_layers, num_models)
 
         self.conv = conv_layer(
             filters=3,
             kernel_size=1,
+            data_format=data_format,
             name='{}-conv-1x1'.format(self.name))
 
     def call(self, x):
         return self.conv(x)
 
     def get_config(self):
-        config = {'use_equalized_layers': self.use_equalized_layers}
+        config = {
+            'use_equalized_layers': self.use_equalized_layers,
+            'data_format': self.data_format,
+            'num_models': self.num_models
+        }
         base_config = super(ToRGBBlock, self).get_config()
         return dict(list(base_config.items()) + list(config.items()))
 
 
 class DiscriminatorDownsampleBlock(tf.keras.layers.Layer):
 
-    def __init__(self, filters, use_equalized_layers=True, **kwargs):
+    def __init__(self,
+                 filters,
+                 use_equalized_layers=True,
+                 data_format='channels_last',
+                 num_models=1,
+                 **kwargs):
         super(DiscriminatorDownsampleBlock, self).__init__(**kwargs)
 
         assert isinstance(
@@ -134,9 +189,10 @@ class DiscriminatorDownsampleBlock(tf.keras.layers.Layer):
         ), 'filters should be a list or a tuple'
         self.filters = filters
         self.use_equalized_layers = use_equalized_layers
+        self.data_format = data_format
+        self.num_models = num_models
 
-        conv_layer = \
-            EqualizedConv2d if use_equalized_layers else tf.keras.layers.Conv2D
+        conv_layer = _conv_layer(use_equalized_layers, num_models)
 
         self.leaky_relu = tf.keras.layers.LeakyReLU(
             alpha=0.2,
@@ -146,16 +202,19 @@ class DiscriminatorDownsampleBlock(tf.keras.layers.Layer):
             filters=filters[0],
             kernel_size=3,
             padding='same',
+            data_format=data_format,
             name='{}-conv-3x3-1'.format(self.name))
 
         self.conv_2 = conv_layer(
             filters=filters[1],
             kernel_size=3,
             padding='same',
+            data_format=data_format,
             name='{}-conv-3x3-2'.format(self.name))
 
         self.downsample_2x = tf.keras.layers.AveragePooling2D(
             pool_size=2,
+            data_format=data_format,
             name='{}-avgpool2d-2x-downsampling'.format(self.name))
 
     def call(self, x):
@@ -167,7 +226,9 @@ class DiscriminatorDownsampleBlock(tf.keras.layers.Layer):
     def get_config(self):
         config = {
             'filters': self.filters,
-            'use_equalized_layers': self.use_equalized_layers
+            'use_equalized_layers': self.use_equalized_layers,
+            'data_format': self.data_format,
+            'num_models': self.num_models
         }
         base_config = super(DiscriminatorDownsampleBlock, self).get_config()
         return dict(list(base_config.items()) + list(config.items()))
@@ -179,15 +240,18 @@ class DiscriminatorFinalBlock(tf.keras.layers.Layer):
                  filters,
                  use_equalized_layers=True,
                  group_size=4,
+                 data_format='channels_last',
+                 num_models=1,
                  **kwargs):
         super(DiscriminatorFinalBlock, self).__init__(**kwargs)
 
         self.filters = filters
         self.group_size = group_size
         self.use_equalized_layers = use_equalized_layers
+        self.data_format = data_format
+        self.num_models = num_models
 
-        conv_layer = \
-            EqualizedConv2d if use_equalized_layers else tf.keras.layers.Conv2D
+        conv_layer = _conv_layer(use_equalized_layers, num_models)
 
         self.leaky_relu = tf.keras.layers.LeakyReLU(
             alpha=0.2,
@@ -195,22 +259,27 @@ class DiscriminatorFinalBlock(tf.keras.layers.Layer):
 
         self.mini_batch_stddev = MiniBatchStandardDeviation(
             group_size=group_size,
+            data_format=data_format,
+            num_models=num_models,
             name='{}-minibatch_stddev'.format(self.name))
 
         self.conv_1 = conv_layer(
             filters=filters,
             kernel_size=3,
             padding='same',
+            data_format=data_format,
             name='{}-conv-3x3-1'.format(self.name))
 
         self.conv_2 = conv_layer(filters=filters,
                                  kernel_size=4,
                                  padding='valid',
+                                 data_format=data_format,
                                  name='{}-conv-4x4-2'.format(self.name))
         self.conv_3 = conv_layer(
             filters=1,
             kernel_size=1,
             padding='valid',
+            data_format=data_format,
             name='{}-conv-1x1-3'.format(self.name))
 
         self.flatten = tf.keras.layers.Flatten()
@@ -226,7 +295,9 @@ class DiscriminatorFinalBlock(tf.keras.layers.Layer):
         config = {
             'filters': self.filters,
             'group_size': self.group_size,
-            'use_equalized_layers': self.use_equalized_layers
+            'use_equalized_layers': self.use_equalized_layers,
+            'data_format': self.data_format,
+            'num_models': self.num_models
         }
         base_config = super(DiscriminatorFinalBlock, self).get_config()
         return dict(list(base_config.items()) + list(config.items()))
@@ -234,14 +305,20 @@ class DiscriminatorFinalBlock(tf.keras.layers.Layer):
 
 class FromRGBBlock(tf.keras.layers.Layer):
 
-    def __init__(self, filters, use_equalized_layers=True, **kwargs):
+    def __init__(self,
+                 filters,
+                 use_equalized_layers=True,
+                 data_format='channels_last',
+                 num_models=1,
+                 **kwargs):
         super(FromRGBBlock, self).__init__(**kwargs)
 
         self.filters = filters
         self.use_equalized_layers = use_equalized_layers
+        self.data_format = data_format
+        self.num_models = num_models
 
-        conv_layer = \
-            EqualizedConv2d if use_equalized_layers else tf.keras.layers.Conv2D
+        conv_layer = _conv_layer(use_equalized_layers, num_models)
 
         self.leaky_relu = tf.keras.layers.LeakyReLU(
             alpha=0.2,
@@ -249,6 +326,7 @@ class FromRGBBlock(tf.keras.layers.Layer):
 
         self.conv = conv_layer(filters=filters,
                                kernel_size=1,
+                               data_format=data_format,
                                name='{}-conv-1x1'.format(self.name))
 
     def call(self, x):
@@ -257,7 +335,9 @@ class FromRGBBlock(tf.keras.layers.Layer):
     def get_config(self):
         config = {
             'filters': self.filters,
-            'use_equalized_layers': self.use_equalized_layers
+            'use_equalized_layers': self.use_equalized_layers,
+            'data_format': self.data_format,
+            'num_models': self.num_models
         }
         base_config = super(FromRGBBlock, self).get_config()
         return dict(list(base_config.items()) + list(config.items()))
@@ -0,0 +1,49 @@
+import tensorflow as tf
+from absl import logging
+
+
+class AlphaSchedule(tf.Module):
+
+    def __init__(self, fade_in_images, name='alpha_schedule'):
+        super(AlphaSchedule, self).__init__(name=name)
+
+        self.fade_in_images = fade_in_images
+        self.depth = tf.Variable(0,
+                                 trainable=False,
+                                 name='depth',
+                                 dtype=tf.int32)
+        self.images_seen = tf.Variable(0,
+                                       trainable=False,
+                                       name='images_seen',
+                                       dtype=tf.int64)
+        self.fading = tf.Variable(False,
+                                  trainable=False,
+                                  name='fading',
+                                  dtype=tf.bool)
+        self.alpha = tf.Variable(1.0,
+                                 trainable=False,
+                                 name='alpha',
+                                 dtype=tf.float32)
+
+    def update(self, num_images):
+        images_seen = self.images_seen.assign_add(
+            tf.cast(num_images, dtype=tf.int64))
+
+        if self.fade_in_images <= 0:
+            return self.alpha.assign(1.0)
+
+        progress = tf.minimum(
+            1.0, tf.cast(images_seen, dtype=tf.float32) / self.fade_in_images)
+        return self.alpha.assign(tf.where(self.fading, progress, 1.0))
+
+    def reset(self, depth):
+        depth = int(depth)
+        if depth == int(self.depth.numpy()):
+            return
+
+        logging.info('Resetting alpha schedule for depth {}, fading in over '
+                     '{} images'.format(depth, self.fade_in_images))
+        self.depth.assign(depth)
+        self.images_seen.assign(0)
+        self.fading.assign(self.fade_in_images > 0)
+        self.alpha.assign(0.0 if self.fade_in_images > 0 else 1.0)
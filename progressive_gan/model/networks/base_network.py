@@ -5,7 +5,14 @@ from absl import logging
 
 class BaseNetwork(tf.keras.Model):
 
-    def __init__(self, max_resolution, use_equalized_layers, name, **kwargs):
+    def __init__(self,
+                 max_resolution,
+                 use_equalized_layers,
+                 name,
+                 data_format='channels_last',
+                 num_models=1,
+                 alpha_schedule=None,
+                 **kwargs):
         super(BaseNetwork, self).__init__(name=name, **kwargs)
 
         self.min_depth = 2
@@ -13,11 +20,21 @@ class BaseNetwork(tf.keras.Model):
         self.max_resolution = max_resolution
         self.max_depth = int(np.log2(max_resolution))
         self.use_equalized_layers = use_equalized_layers
+        self.data_format = data_format
+        self.num_models = num_models
+        self.alpha_schedule = alpha_schedule
         self._current_depth = tf.Variable(self.current_depth,
                                           trainable=False,
                                           name='current_depth',
                                           dtype=tf.uint8)
 
+    def _split_inputs(self, x):
+        if isinstance(x, (list, tuple)):
+            return x
+        assert self.alpha_schedule is not None, \
+            'alpha is required when no alpha schedule is attached'
+        return x, self.alpha_schedule.alpha
+
     @staticmethod
     def _nf(stage, fmap_base=8192, fmap_max=512, fmap_decay=1.0):
         return min(int(fmap_base / (2.0**(stage * fmap_decay))), fmap_max)
@@ -29,6 +46,8 @@ class BaseNetwork(tf.keras.Model):
                 self.current_depth, depth))
             self.current_depth = depth
             self._current_depth.assign(depth)
+            if self.alpha_schedule is not None:
+                self.alpha_schedule.reset(self.current_depth)
 
     def increment_depth(self):
         assert self.current_depth != self.max_depth + 1, 'Max Depth Exceeded'
@@ -36,6 +55,8 @@ class BaseNetwork(tf.keras.Model):
             self.current_depth, self.current_depth + 1))
         self.current_depth += 1
         self._current_depth.assign_add(1)
+        if self.alpha_schedule is not None:
+            self.alpha_schedule.reset(self.current_depth)
 
     def restore_current_depth(self):
         depth = self._current_depth.numpy()
@@ -8,16 +8,27 @@ from progressive_gan.model import (BaseNetwork, DiscriminatorDownsampleBlock,
 
 class Generator(BaseNetwork):
 
-    def __init__(self, max_resolution, use_equalized_layers, **kwargs):
+    def __init__(self,
+                 max_resolution,
+                 use_equalized_layers,
+                 data_format='channels_last',
+                 num_models=1,
+                 alpha_schedule=None,
+                 **kwargs):
         super(Generator, self).__init__(
             max_resolution=max_resolution,
             use_equalized_layers=use_equalized_layers,
+            data_format=data_format,
+            num_models=num_models,
+            alpha_schedule=alpha_schedule,
             name='Generator', **kwargs)
 
         self.blocks = {
             '2':
                 GeneratorBaseBlock(filters=Generator._nf(stage=1),
                                    use_equalized_layers=use_equalized_layers,
+                                   data_format=data_format,
+                                   num_models=num_models,
                                    name='depth-2-conv-block')
         }
 
@@ -25,19 +36,43 @@ class Generator(BaseNetwork):
             self.blocks[str(stage + 1)] = GeneratorUpsampleBlock(
                 filters=Generator._nf(stage=stage),
                 use_equalized_layers=use_equalized_layers,
+                data_format=data_format,
+                num_models=num_models,
                 name='depth-{}-conv-block'.format(stage + 1))
 
         self.upscale_2x = tf.keras.layers.UpSampling2D(
-            size=2, interpolation='nearest', name='nearest-2x-upsampling')
+            size=2,
+            interpolation='nearest',
+            data_format=data_format,
+            name='nearest-2x-upsampling')
+
+        self.downscale_2x = tf.keras.layers.AvgPool2D(
+            pool_size=2,
+            data_format=data_format,
+            name='avgpool2d-2x-downsampling')
 
         self.to_rgb_blocks = {
             str(i + 1): ToRGBBlock(use_equalized_layers=use_equalized_layers,
+                                   data_format=data_format,
+                                   num_models=num_models,
                                    name='depth-{}-to-rgb'.format(i + 1))
             for i in range(1, self.max_depth)
         }
 
-    def call(self, x):
-        noise, alpha = x
+    def call(self, x, return_pyramid=False):
+        noise, alpha = self._split_inputs(x)
+        images = self._generate(noise, alpha)
+        if not return_pyramid:
+            return images
+
+        # Lower levels are pooled from the final image instead of taken from
+        # the lower to_rgb heads, which stop training once alpha reaches 1.
+        pyramid = [images]
+        for _ in range(self.min_depth, self.current_depth):
+            pyramid.insert(0, self.downscale_2x(pyramid[0]))
+        return pyramid
+
+    def _generate(self, noise, alpha):
         y = noise
 
         if self.current_depth == self.min_depth:
@@ -56,11 +91,19 @@ class Generator(BaseNetwork):
 
 
 class Discriminator(BaseNetwork):
-    def __init__(self, max_resolution, use_equalized_layers, **kwargs):
-
+    def __init__(self,
+                 max_resolution,
+                 use_equalized_layers,
+                 data_format='channels_last',
+                 num_models=1,
+                 alpha_schedule=None,
+                 **kwargs):
         super(Discriminator, self).__init__(
             max_resolution=max_resolution,
             use_equalized_layers=use_equalized_layers,
+            data_format=data_format,
+            num_models=num_models,
+            alpha_schedule=alpha_schedule,
             name='Discriminator', **kwargs)
 
         self.blocks = {
@@ -68,6 +111,8 @@ class Discriminator(BaseNetwork):
                 DiscriminatorFinalBlock(
                     filters=Discriminator._nf(stage=1),
                     use_equalized_layers=use_equalized_layers,
+                    data_format=data_format,
+                    num_models=num_models,
                     name='depth-2-conv-block')
         }
 
@@ -78,20 +123,26 @@ class Discriminator(BaseNetwork):
                     Discriminator._nf(stage=stage - 1)
                 ],
                 use_equalized_layers=use_equalized_layers,
+                data_format=data_format,
+                num_models=num_models,
                 name='depth-{}-conv-block'.format(stage + 1))
 
         self.downscale_2x = tf.keras.layers.AvgPool2D(
-            pool_size=2, name='avgpool2d-2x-downsampling')
+            pool_size=2,
+            data_format=data_format,
+            name='avgpool2d-2x-downsampling')
 
         self.from_rgb_blocks = {
             str(i + 1): FromRGBBlock(filters=Discriminator._nf(stage=i),
                                      use_equalized_layers=use_equalized_layers,
+                                     data_format=data_format,
+                                     num_models=num_models,
                                      name='depth-{}-from-rgb'.format(i + 1))
             for i in range(1, self.max_depth)
         }
 
     def call(self, x):
-        images, alpha = x
+        images, alpha = self._split_inputs(x)
         y = images
 
         if self.current_depth == self.min_depth:
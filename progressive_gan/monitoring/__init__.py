@@ -0,0 +1,4 @@
+from progressive_gan.monitoring.snapshot_writer import SnapshotWriter
+from progressive_gan.monitoring.step_profiler import StepProfiler
+
+__all__ = ['SnapshotWriter', 'StepProfiler']
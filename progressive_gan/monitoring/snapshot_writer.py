@@ -0,0 +1,130 @@
+import os
+import queue
+import threading
+
+import numpy as np
+import tensorflow as tf
+from absl import logging
+
+
+class SnapshotWriter:
+
+    def __init__(self,
+                 generator,
+                 log_dir,
+                 interval=1000,
+                 num_samples=16,
+                 latent_dim=512,
+                 queue_size=2,
+                 seed=0):
+        self.generator = generator
+        self.log_dir = log_dir
+        self.interval = interval
+        self.num_samples = num_samples
+        self.dropped_snapshots = 0
+
+        self.snapshot_dir = os.path.join(log_dir, 'snapshots')
+        tf.io.gfile.makedirs(self.snapshot_dir)
+
+        self.latents = tf.Variable(
+            tf.random.stateless_normal([num_samples, latent_dim],
+                                       seed=[seed, 0]),
+            trainable=False,
+            name='snapshot_latents')
+
+        self._generate_fns = {}
+        self._summary_writer = tf.summary.create_file_writer(log_dir)
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run,
+                                        name='snapshot-writer',
+                                        daemon=True)
+        self._thread.start()
+
+    def _generate_fn(self, depth):
+        if depth not in self._generate_fns:
+
+            @tf.function
+            def generate(alpha):
+                images = self.generator((self.latents, alpha))
+                if self.generator.data_format == 'channels_first':
+                    images = tf.transpose(images, perm=[0, 2, 3, 1])
+                return images
+
+            self._generate_fns[depth] = generate
+        return self._generate_fns[depth]
+
+    def maybe_snapshot(self, step, alpha=None, scalars=None):
+        step = int(step)
+        if step % self.interval:
+            return False
+
+        if self._queue.full():
+            self.dropped_snapshots += 1
+            logging.warning('Snapshot writer is behind, dropping step {}'
+                            .format(step))
+            return False
+
+        if alpha is None:
+            assert self.generator.alpha_schedule is not None, \
+                'alpha is required when no alpha schedule is attached'
+            alpha = self.generator.alpha_schedule.alpha
+
+        depth = self.generator.current_depth
+        images = self._generate_fn(depth)(
+            tf.convert_to_tensor(alpha, dtype=tf.float32))
+
+        try:
+            self._queue.put_nowait((step, depth, images, scalars or {}))
+        except queue.Full:
+            self.dropped_snapshots += 1
+            logging.warning('Snapshot writer is behind, dropping step {}'
+                            .format(step))
+            return False
+        return True
+
+    @staticmethod
+    def _tile(images):
+        n, h, w, c = images.shape
+        cols = int(np.ceil(np.sqrt(n)))
+        rows = int(np.ceil(n / cols))
+
+        grid = np.zeros([rows * cols, h, w, c], dtype=np.uint8)
+        grid[:n] = np.clip(np.round(images), 0, 255).astype(np.uint8)
+        grid = grid.reshape(rows, cols, h, w, c)
+        return grid.transpose(0, 2, 1, 3, 4).reshape(rows * h, cols * w, c)
+
+    def _write(self, step, depth, images, scalars):
+        grid = SnapshotWriter._tile(np.asarray(images))
+
+        fname = 'depth-{:02d}-step-{:08d}.png'.format(depth, step)
+        tf.io.write_file(os.path.join(self.snapshot_dir, fname),
+                         tf.io.encode_png(grid))
+
+        with self._summary_writer.as_default():
+            tf.summary.image('depth-{}/samples'.format(depth),
+                             grid[np.newaxis],
+                             step=step)
+            for name, value in scalars.items():
+                tf.summary.scalar('depth-{}/{}'.format(depth, name),
+                                  float(value),
+                                  step=step)
+        self._summary_writer.flush()
+
+    def _run(self):
+        while True:
+            snapshot = self._queue.get()
+            if snapshot is None:
+                break
+
+            try:
+                self._write(*snapshot)
+            except Exception:
+                logging.exception('Failed to write snapshot for step {}'
+                                  .format(snapshot[0]))
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+        self._summary_writer.close()
+        logging.info('Closed snapshot writer, dropped {} snapshots'.format(
+            self.dropped_snapshots))
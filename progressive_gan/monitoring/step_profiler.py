@@ -0,0 +1,188 @@
+import collections
+import contextlib
+import json
+import os
+import time
+
+import numpy as np
+import tensorflow as tf
+from absl import logging
+
+
+class StepProfiler:
+
+    _METRICS = ['step_time', 'data_wait_time', 'dispatch_time']
+
+    def __init__(self,
+                 log_dir,
+                 network=None,
+                 trace_steps_after_depth_change=0,
+                 trace_windows=(),
+                 history_size=1000):
+        self.log_dir = log_dir
+        self.network = network
+        self.trace_steps_after_depth_change = trace_steps_after_depth_change
+        self.trace_windows = [tuple(window) for window in trace_windows]
+        self.history_size = history_size
+
+        self.current_depth = None
+        self._history = {
+            metric: collections.deque(maxlen=history_size)
+            for metric in StepProfiler._METRICS
+        }
+        self._counters = {}
+        self._tracked_functions = {}
+        self._tracing_counts_at_depth_start = {}
+        self._tracing = False
+        self._current_step = None
+        self._pending = {}
+
+        self._summary_writer = tf.summary.create_file_writer(
+            os.path.join(log_dir, 'profiler'))
+
+    def track_function(self, name, fn):
+        self._tracked_functions[name] = fn
+        self._tracing_counts_at_depth_start[name] = \
+            fn.experimental_get_tracing_count()
+
+    def _retraces(self):
+        retraces = 0
+        for name, fn in self._tracked_functions.items():
+            traces = fn.experimental_get_tracing_count() - \
+                self._tracing_counts_at_depth_start[name]
+            retraces += max(0, traces - 1)
+        return retraces
+
+    def on_depth_change(self, depth, step):
+        logging.info('Profiling depth {} from step {}'.format(depth, step))
+        self.current_depth = int(depth)
+        self._tracing_counts_at_depth_start = {
+            name: fn.experimental_get_tracing_count()
+            for name, fn in self._tracked_functions.items()
+        }
+        self._counters.setdefault(str(self.current_depth), {
+            'steps': 0,
+            'images': 0,
+            'step_time': 0.0,
+            'retraces': 0
+        })
+
+        if self.trace_steps_after_depth_change > 0:
+            self.trace_windows.append(
+                (step, step + self.trace_steps_after_depth_change))
+
+    def _in_trace_window(self, step):
+        return any(start <= step < stop for start, stop in self.trace_windows)
+
+    def _update_trace(self, step):
+        in_window = self._in_trace_window(step)
+        if in_window and not self._tracing:
+            logging.info('Starting profiler trace at step {}'.format(step))
+            tf.profiler.experimental.start(self.log_dir)
+            self._tracing = True
+        elif not in_window and self._tracing:
+            logging.info('Stopping profiler trace at step {}'.format(step))
+            tf.profiler.experimental.stop()
+            self._tracing = False
+
+    @contextlib.contextmanager
+    def _timed(self, metric):
+        start = time.perf_counter()
+        yield
+        self._pending[metric] = \
+            self._pending.get(metric, 0.0) + time.perf_counter() - start
+
+    def data_wait(self):
+        return self._timed('data_wait_time')
+
+    def dispatch(self):
+        return self._timed('dispatch_time')
+
+    @contextlib.contextmanager
+    def step(self, step, num_images):
+        step = int(step)
+        if self.network is not None and \
+                self.network.current_depth != self.current_depth:
+            self.on_depth_change(self.network.current_depth, step)
+        assert self.current_depth is not None, \
+            'Pass a network or call on_depth_change() before the first step'
+
+        self._current_step = step
+        self._pending = {}
+        self._update_trace(step)
+
+        start = time.perf_counter()
+        with tf.profiler.experimental.Trace('train', step_num=step, _r=1):
+            yield
+        step_time = time.perf_counter() - start
+
+        self._history['step_time'].append(step_time)
+        for metric in ['data_wait_time', 'dispatch_time']:
+            self._history[metric].append(self._pending.get(metric, 0.0))
+
+        counters = self._counters[str(self.current_depth)]
+        counters['steps'] += 1
+        counters['images'] += int(num_images)
+        counters['step_time'] += step_time
+        counters['retraces'] = self._retraces()
+
+    def summary(self):
+        histograms = {}
+        for metric, values in self._history.items():
+            if not values:
+                continue
+            values = np.array(values)
+            histograms[metric] = {
+                'mean': float(np.mean(values)),
+                'p50': float(np.percentile(values, 50)),
+                'p90': float(np.percentile(values, 90)),
+                'p99': float(np.percentile(values, 99)),
+                'max': float(np.max(values))
+            }
+
+        depths = {}
+        for depth, counters in self._counters.items():
+            images_per_sec = counters['images'] / counters['step_time'] \
+                if counters['step_time'] else 0.0
+            depths[depth] = dict(counters, images_per_sec=images_per_sec)
+
+        return {
+            'step': self._current_step,
+            'histograms': histograms,
+            'depths': depths
+        }
+
+    def export_json(self, path=None):
+        if path is None:
+            path = os.path.join(self.log_dir, 'profiler', 'summary.json')
+        tf.io.gfile.makedirs(os.path.dirname(path))
+        with tf.io.gfile.GFile(path, 'w') as fp:
+            json.dump(self.summary(), fp, indent=4)
+        return path
+
+    def write_summaries(self, step):
+        summary = self.summary()
+        with self._summary_writer.as_default():
+            for metric, values in self._history.items():
+                if values:
+                    tf.summary.histogram('profiler/{}'.format(metric),
+                                         np.array(values),
+                                         step=step)
+
+            for depth, counters in summary['depths'].items():
+                tf.summary.scalar(
+                    'profiler/depth-{}/images_per_sec'.format(depth),
+                    counters['images_per_sec'],
+                    step=step)
+                tf.summary.scalar(
+                    'profiler/depth-{}/retraces'.format(depth),
+                    counters['retraces'],
+                    step=step)
+        self._summary_writer.flush()
+
+    def close(self):
+        if self._tracing:
+            tf.profiler.experimental.stop()
+            self._tracing = False
+        self.export_json()
+        self._summary_writer.close()
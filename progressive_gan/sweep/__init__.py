@@ -0,0 +1,4 @@
+from progressive_gan.sweep.vectorized_sweep import (StackedAdam,
+                                                    VectorizedSweep)
+
+__all__ = ['StackedAdam', 'VectorizedSweep']
@@ -0,0 +1,125 @@
+import json
+import os
+
+import tensorflow as tf
+from absl import app, flags, logging
+
+from progressive_gan.cfg import Config
+from progressive_gan.sweep.vectorized_sweep import VectorizedSweep
+
+flags.DEFINE_string('config_path',
+                    default=None,
+                    help='Path to the training config')
+
+flags.DEFINE_list('learning_rates',
+                  default=['0.001'],
+                  help='Learning rate of every stacked replica')
+
+flags.DEFINE_integer('batch_size',
+                     default=16,
+                     help='Batch size of each replica')
+
+flags.DEFINE_integer('latent_dim',
+                     default=512,
+                     help='Size of the generator latent vector')
+
+flags.DEFINE_integer('max_depth',
+                     default=5,
+                     help='Last depth trained in the sweep')
+
+flags.DEFINE_integer('steps_per_depth',
+                     default=10000,
+                     help='Number of training steps at every depth')
+
+flags.DEFINE_integer('fade_in_images',
+                     default=80000,
+                     help='Number of images used to fade in a new depth')
+
+flags.DEFINE_integer('benchmark_steps',
+                     default=0,
+                     help='Compare sweep throughput against a single run '
+                     'for this many steps before training')
+
+flags.DEFINE_string('sweep_dir',
+                    default='./sweep',
+                    help='Path to store summaries and checkpoints in.')
+
+FLAGS = flags.FLAGS
+
+
+def benchmark(params, learning_rates):
+    single_run = VectorizedSweep(params,
+                                 learning_rates=learning_rates[:1],
+                                 batch_size=FLAGS.batch_size,
+                                 fade_in_images=FLAGS.fade_in_images,
+                                 latent_dim=FLAGS.latent_dim,
+                                 log_dir=os.path.join(FLAGS.sweep_dir,
+                                                      'benchmark'))
+    single_images_per_sec = single_run.benchmark(FLAGS.benchmark_steps)
+
+    sweep = VectorizedSweep(params,
+                            learning_rates=learning_rates,
+                            batch_size=FLAGS.batch_size,
+                            fade_in_images=FLAGS.fade_in_images,
+                            latent_dim=FLAGS.latent_dim,
+                            log_dir=os.path.join(FLAGS.sweep_dir,
+                                                 'benchmark'))
+    sweep_images_per_sec = sweep.benchmark(FLAGS.benchmark_steps)
+
+    results = {
+        'num_models': len(learning_rates),
+        'single_run_images_per_sec': single_images_per_sec,
+        'sweep_images_per_sec': sweep_images_per_sec,
+        'speedup_vs_separate_runs':
+            sweep_images_per_sec / single_images_per_sec
+    }
+    logging.info('Sweep throughput: {}'.format(results))
+    return results
+
+
+def main(_):
+    tf.io.gfile.makedirs(FLAGS.sweep_dir)
+
+    params = Config(FLAGS.config_path).params
+    learning_rates = [float(lr) for lr in FLAGS.learning_rates]
+
+    if FLAGS.benchmark_steps:
+        results = benchmark(params, learning_rates)
+        with tf.io.gfile.GFile(
+                os.path.join(FLAGS.sweep_dir, 'throughput.json'), 'w') as fp:
+            json.dump(results, fp, indent=4)
+
+    sweep = VectorizedSweep(params,
+                            learning_rates=learning_rates,
+                            batch_size=FLAGS.batch_size,
+                            fade_in_images=FLAGS.fade_in_images,
+                            latent_dim=FLAGS.latent_dim,
+                            log_dir=FLAGS.sweep_dir)
+
+    metrics = {}
+    while True:
+        depth = sweep.generator.current_depth
+        losses, images_per_sec = sweep.train(FLAGS.steps_per_depth)
+        metrics[str(depth)] = {
+            'images_per_sec': images_per_sec,
+            'replicas': [{
+                'learning_rate': learning_rates[k],
+                'd_loss': float(losses['d_loss'][k]),
+                'g_loss': float(losses['g_loss'][k])
+            } for k in range(len(learning_rates))]
+        }
+        sweep.save()
+
+        if depth == FLAGS.max_depth:
+            break
+        sweep.increment_depth()
+
+    sweep.export_replicas()
+    with tf.io.gfile.GFile(os.path.join(FLAGS.sweep_dir, 'metrics.json'),
+                           'w') as fp:
+        json.dump(metrics, fp, indent=4)
+
+
+if __name__ == '__main__':
+    flags.mark_flags_as_required(['config_path'])
+    app.run(main)
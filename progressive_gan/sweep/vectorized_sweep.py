@@ -0,0 +1,277 @@
+import os
+import time
+
+import tensorflow as tf
+from absl import logging
+
+from progressive_gan.dataloader import InputPipeline, PreprocessingPipeline
+from progressive_gan.model import AlphaSchedule, Discriminator, Generator
+
+
+class StackedAdam(tf.Module):
+
+    def __init__(self,
+                 learning_rates,
+                 beta_1=0.0,
+                 beta_2=0.99,
+                 epsilon=1e-8,
+                 name='StackedAdam'):
+        super(StackedAdam, self).__init__(name=name)
+        self.learning_rates = tf.constant(learning_rates, dtype=tf.float32)
+        self.num_models = len(learning_rates)
+        self.beta_1 = beta_1
+        self.beta_2 = beta_2
+        self.epsilon = epsilon
+        self.iterations = tf.Variable(0,
+                                      trainable=False,
+                                      name='iterations',
+                                      dtype=tf.int64)
+        self._slots = {}
+
+    def _get_slots(self, var):
+        key = var.name.replace(':', '_').replace('/', '.')
+        if key not in self._slots:
+            with tf.init_scope():
+                self._slots[key] = {
+                    'm': tf.Variable(tf.zeros_like(var), trainable=False),
+                    'v': tf.Variable(tf.zeros_like(var), trainable=False)
+                }
+        return self._slots[key]['m'], self._slots[key]['v']
+
+    def apply_gradients(self, grads_and_vars):
+        step = tf.cast(self.iterations + 1, dtype=tf.float32)
+        correction = tf.sqrt(1 - self.beta_2**step) / (1 - self.beta_1**step)
+
+        for grad, var in grads_and_vars:
+            if self.num_models == 1:
+                learning_rates = self.learning_rates[0]
+            else:
+                assert var.shape[0] == self.num_models, \
+                    'Variable {} is not stacked along the model axis'.format(
+                        var.name)
+                learning_rates = tf.reshape(
+                    self.learning_rates,
+                    [self.num_models] + [1] * (len(var.shape) - 1))
+
+            m, v = self._get_slots(var)
+            m.assign(self.beta_1 * m + (1 - self.beta_1) * grad)
+            v.assign(self.beta_2 * v + (1 - self.beta_2) * tf.square(grad))
+
+            var.assign_sub(learning_rates * correction * m /
+                           (tf.sqrt(v) + self.epsilon))
+        self.iterations.assign_add(1)
+
+
+class VectorizedSweep:
+
+    def __init__(self,
+                 params,
+                 learning_rates,
+                 batch_size,
+                 fade_in_images=0,
+                 latent_dim=512,
+                 gp_weight=10.0,
+                 drift_weight=0.001,
+                 log_dir='./sweep'):
+        self.params = params
+        self.learning_rates = list(learning_rates)
+        self.num_models = len(self.learning_rates)
+        self.batch_size = batch_size
+        self.latent_dim = latent_dim
+        self.gp_weight = gp_weight
+        self.drift_weight = drift_weight
+        self.log_dir = log_dir
+        self.max_resolution = params.model_params.max_resolution
+
+        self.alpha_schedule = AlphaSchedule(fade_in_images)
+        self.generator = Generator(max_resolution=self.max_resolution,
+                                   use_equalized_layers=True,
+                                   num_models=self.num_models,
+                                   alpha_schedule=self.alpha_schedule)
+        self.discriminator = Discriminator(
+            max_resolution=self.max_resolution,
+            use_equalized_layers=True,
+            num_models=self.num_models,
+            alpha_schedule=self.alpha_schedule)
+
+        self.g_optimizer = StackedAdam(self.learning_rates,
+                                       name='GeneratorAdam')
+        self.d_optimizer = StackedAdam(self.learning_rates,
+                                       name='DiscriminatorAdam')
+
+        self.checkpoint = tf.train.Checkpoint(
+            generator=self.generator,
+            discriminator=self.discriminator,
+            g_optimizer=self.g_optimizer,
+            d_optimizer=self.d_optimizer,
+            alpha_schedule=self.alpha_schedule)
+
+        self.input_pipeline = InputPipeline(params)
+        self._summary_writer = tf.summary.create_file_writer(log_dir)
+        self._set_depth(self.generator.current_depth)
+
+    def _set_depth(self, depth):
+        self.generator.assign_depth(depth)
+        self.discriminator.assign_depth(depth)
+
+        self.preprocessing_pipeline = PreprocessingPipeline(
+            max_resolution=self.max_resolution,
+            current_depth=depth,
+            alpha_schedule=self.alpha_schedule)
+
+        dataset = self.input_pipeline(depth=depth, batch_size=self.batch_size)
+        dataset = dataset.prefetch(tf.data.experimental.AUTOTUNE)
+        self._iterator = iter(dataset)
+        self._train_step = tf.function(self._train_step_impl)
+
+    def increment_depth(self):
+        self._set_depth(self.generator.current_depth + 1)
+
+    def _per_model_mean(self, values):
+        return tf.reduce_mean(tf.reshape(values, [self.num_models, -1]),
+                              axis=1)
+
+    def _train_step_impl(self, sample):
+        self.alpha_schedule.update(self.batch_size)
+
+        real_images = self.preprocessing_pipeline(sample)['images']
+        real_images = tf.tile(real_images, [self.num_models, 1, 1, 1])
+        num_images = self.num_models * self.batch_size
+
+        noise = tf.random.normal([num_images, self.latent_dim])
+        with tf.GradientTape() as tape:
+            fake_images = self.generator(noise)
+            real_scores = self.discriminator(real_images)
+            fake_scores = self.discriminator(fake_images)
+
+            epsilon = tf.random.uniform([num_images, 1, 1, 1])
+            interpolated_images = \
+                epsilon * real_images + (1 - epsilon) * fake_images
+            with tf.GradientTape() as gp_tape:
+                gp_tape.watch(interpolated_images)
+                interpolated_scores = self.discriminator(
+                    interpolated_images)
+            gp_grads = gp_tape.gradient(interpolated_scores,
+                                        interpolated_images)
+            gp_norms = tf.sqrt(
+                tf.reduce_sum(tf.square(gp_grads), axis=[1, 2, 3]) +
+                tf.keras.backend.epsilon())
+
+            d_losses = self._per_model_mean(
+                fake_scores[:, 0] - real_scores[:, 0] +
+                self.gp_weight * tf.square(gp_norms - 1) +
+                self.drift_weight * tf.square(real_scores[:, 0]))
+            d_loss = tf.reduce_sum(d_losses)
+
+        d_variables = self.discriminator.trainable_variables
+        d_grads = tape.gradient(d_loss, d_variables)
+        self.d_optimizer.apply_gradients(zip(d_grads, d_variables))
+
+        noise = tf.random.normal([num_images, self.latent_dim])
+        with tf.GradientTape() as tape:
+            fake_images = self.generator(noise)
+            fake_scores = self.discriminator(fake_images)
+            g_losses = self._per_model_mean(-fake_scores[:, 0])
+            g_loss = tf.reduce_sum(g_losses)
+
+        g_variables = self.generator.trainable_variables
+        g_grads = tape.gradient(g_loss, g_variables)
+        self.g_optimizer.apply_gradients(zip(g_grads, g_variables))
+
+        return {'d_loss': d_losses, 'g_loss': g_losses}
+
+    def train_step(self):
+        return self._train_step(next(self._iterator))
+
+    def train(self, num_steps, summary_interval=100):
+        depth = self.generator.current_depth
+        start = time.perf_counter()
+
+        for step in range(num_steps):
+            losses = self.train_step()
+
+            if (step + 1) % summary_interval == 0:
+                self.write_summaries(losses)
+
+        losses = {name: value.numpy() for name, value in losses.items()}
+        elapsed = time.perf_counter() - start
+        images_per_sec = \
+            num_steps * self.batch_size * self.num_models / elapsed
+        logging.info('Depth {}: {:.1f} images/sec across {} replicas'.format(
+            depth, images_per_sec, self.num_models))
+        return losses, images_per_sec
+
+    def write_summaries(self, losses):
+        step = self.g_optimizer.iterations
+        with self._summary_writer.as_default():
+            tf.summary.scalar('alpha', self.alpha_schedule.alpha, step=step)
+            for name, values in losses.items():
+                for k in range(self.num_models):
+                    tf.summary.scalar('replica-{}/{}'.format(k, name),
+                                      values[k],
+                                      step=step)
+
+    def save(self):
+        return self.checkpoint.save(os.path.join(self.log_dir, 'ckpt'))
+
+    @staticmethod
+    def _copy_replica(stacked_network, network, k):
+        stacked_variables = {
+            variable.name: variable for variable in stacked_network.variables
+        }
+        assert len(stacked_variables) == len(stacked_network.variables), \
+            'Variable names of {} are not unique'.format(stacked_network.name)
+
+        for variable in network.variables:
+            stacked_variable = stacked_variables.get(variable.name)
+            if stacked_variable is None:
+                assert not variable.trainable, \
+                    'No stacked weights found for {}'.format(variable.name)
+                continue
+            if stacked_variable.shape != variable.shape:
+                stacked_variable = stacked_variable[k]
+            variable.assign(stacked_variable)
+
+    def build_replica(self, k):
+        generator = Generator(max_resolution=self.max_resolution,
+                              use_equalized_layers=True)
+        discriminator = Discriminator(max_resolution=self.max_resolution,
+                                      use_equalized_layers=True)
+
+        for depth in range(self.generator.min_depth,
+                           self.generator.current_depth + 1):
+            generator.assign_depth(depth)
+            discriminator.assign_depth(depth)
+            alpha = self.alpha_schedule.alpha
+            images = generator((tf.zeros([1, self.latent_dim]), alpha))
+            discriminator((images, alpha))
+
+        VectorizedSweep._copy_replica(self.generator, generator, k)
+        VectorizedSweep._copy_replica(self.discriminator, discriminator, k)
+        return generator, discriminator
+
+    def export_replica(self, k):
+        generator, discriminator = self.build_replica(k)
+
+        checkpoint = tf.train.Checkpoint(generator=generator,
+                                         discriminator=discriminator)
+        path = checkpoint.save(
+            os.path.join(self.log_dir, 'replica-{}'.format(k), 'ckpt'))
+        logging.info('Exported replica {} (lr={}) to {}'.format(
+            k, self.learning_rates[k], path))
+        return path
+
+    def export_replicas(self):
+        return [self.export_replica(k) for k in range(self.num_models)]
+
+    def benchmark(self, num_steps, num_warmup_steps=5):
+        for _ in range(num_warmup_steps):
+            losses = self.train_step()
+        losses['g_loss'].numpy()
+
+        start = time.perf_counter()
+        for _ in range(num_steps):
+            losses = self.train_step()
+        losses['g_loss'].numpy()
+        elapsed = time.perf_counter() - start
+        return num_steps * self.batch_size * self.num_models / elapsed
@@ -0,0 +1,39 @@
+import numpy as np
+import tensorflow as tf
+
+from progressive_gan.model import Generator
+
+
+class GeneratorTest(tf.test.TestCase):
+
+    def test_pyramid(self):
+        generator = Generator(max_resolution=16, use_equalized_layers=True)
+        generator.assign_depth(4)
+        noise = tf.random.normal([2, 32])
+        alpha = tf.constant(0.5)
+
+        images = generator((noise, alpha))
+        pyramid = generator((noise, alpha), return_pyramid=True)
+
+        self.assertEqual([level.shape for level in pyramid],
+                         [[2, 4, 4, 3], [2, 8, 8, 3], [2, 16, 16, 3]])
+        np.testing.assert_allclose(pyramid[-1].numpy(), images.numpy(),
+                                   rtol=1e-5,
+                                   atol=1e-5)
+        for lower, upper in zip(pyramid[:-1], pyramid[1:]):
+            np.testing.assert_allclose(
+                lower.numpy(),
+                tf.nn.avg_pool2d(upper, ksize=2, strides=2,
+                                 padding='VALID').numpy(),
+                rtol=1e-5,
+                atol=1e-5)
+
+    def test_pyramid_at_min_depth(self):
+        generator = Generator(max_resolution=16, use_equalized_layers=True)
+        pyramid = generator((tf.random.normal([2, 32]), tf.constant(1.0)),
+                            return_pyramid=True)
+        self.assertEqual([level.shape for level in pyramid], [[2, 4, 4, 3]])
+
+
+if __name__ == '__main__':
+    tf.test.main()
@@ -0,0 +1,41 @@
+import numpy as np
+import tensorflow as tf
+
+from progressive_gan.dataloader.pixel_store import PixelStore
+from progressive_gan.dataset_utils.pixel_store_writer import PixelStoreWriter
+
+
+class PixelStoreTest(tf.test.TestCase):
+
+    def setUp(self):
+        super(PixelStoreTest, self).setUp()
+        self.data_dir = self.get_temp_dir()
+
+        writer = PixelStoreWriter(n_samples=10,
+                                  max_resolution=8,
+                                  output_dir=self.data_dir)
+        rng = np.random.default_rng(0)
+        for _ in range(10):
+            writer.push(rng.integers(0, 256, size=(8, 8, 3)))
+        writer.flush()
+
+    def test_batched(self):
+        pixel_store = PixelStore(self.data_dir, seed=0)
+        dataset = pixel_store(depth=3, batch_size=4)
+
+        self.assertEqual(dataset.element_spec['image'].shape, [4, 8, 8, 3])
+        for sample in dataset.take(5):
+            self.assertEqual(sample['image'].dtype, tf.float32)
+            self.assertEqual(sample['image'].shape, [4, 8, 8, 3])
+
+    def test_unbatched(self):
+        pixel_store = PixelStore(self.data_dir, gather_size=4, seed=0)
+        dataset = pixel_store(depth=2)
+
+        self.assertEqual(dataset.element_spec['image'].shape, [4, 4, 3])
+        images = [sample['image'].numpy() for sample in dataset.take(10)]
+        self.assertLen({image.tobytes() for image in images}, 10)
+
+
+if __name__ == '__main__':
+    tf.test.main()
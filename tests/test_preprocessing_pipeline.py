@@ -0,0 +1,26 @@
+import numpy as np
+import tensorflow as tf
+
+from progressive_gan.dataloader import PreprocessingPipeline
+
+
+class PreprocessingPipelineTest(tf.test.TestCase):
+
+    def test_source_resolution_follows_image_shape(self):
+        preprocessing_pipeline = PreprocessingPipeline(max_resolution=32,
+                                                       current_depth=3)
+        images = tf.random.uniform([2, 32, 32, 3], maxval=255)
+        pooled = tf.nn.avg_pool2d(images, ksize=4, strides=4,
+                                  padding='VALID')
+
+        full = preprocessing_pipeline({'image': images}, 0.5)['images']
+        stored = preprocessing_pipeline({'image': pooled}, 0.5)['images']
+
+        self.assertEqual(stored.shape, [2, 8, 8, 3])
+        np.testing.assert_allclose(stored.numpy(), full.numpy(),
+                                   rtol=1e-4,
+                                   atol=1e-3)
+
+
+if __name__ == '__main__':
+    tf.test.main()
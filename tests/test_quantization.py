@@ -0,0 +1,27 @@
+import numpy as np
+import tensorflow as tf
+
+from progressive_gan.export import GeneratorQuantizer
+from progressive_gan.model import Generator
+
+
+class GeneratorQuantizerTest(tf.test.TestCase):
+
+    def test_folded_copy_matches_generator(self):
+        generator = Generator(max_resolution=16, use_equalized_layers=True)
+        noise = tf.random.normal([2, 32])
+        for depth in range(2, 5):
+            generator.assign_depth(depth)
+            generator((noise, tf.constant(1.0)))
+        generator.assign_depth(3)
+
+        quantizer = GeneratorQuantizer(generator, latent_dim=32)
+        np.testing.assert_allclose(
+            quantizer._export_generator((noise, tf.constant(1.0))).numpy(),
+            generator((noise, tf.constant(1.0))).numpy(),
+            rtol=1e-4,
+            atol=1e-4)
+
+
+if __name__ == '__main__':
+    tf.test.main()
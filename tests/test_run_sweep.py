@@ -0,0 +1,18 @@
+import importlib
+
+import tensorflow as tf
+from absl import flags
+
+
+class RunSweepTest(tf.test.TestCase):
+
+    def test_import_defines_flags(self):
+        run_sweep = importlib.import_module('progressive_gan.sweep.run_sweep')
+        self.assertIs(run_sweep.FLAGS, flags.FLAGS)
+        self.assertIn('sweep_dir', flags.FLAGS)
+        self.assertIn('log_dir', flags.FLAGS)
+        self.assertEqual(flags.FLAGS['sweep_dir'].default, './sweep')
+
+
+if __name__ == '__main__':
+    tf.test.main()
@@ -0,0 +1,74 @@
+import numpy as np
+import tensorflow as tf
+
+from progressive_gan.model.layers import (EqualizedConv2d, EqualizedDense,
+                                          MiniBatchStandardDeviation)
+
+NUM_MODELS = 3
+BATCH_SIZE = 8
+
+
+class StackedLayersTest(tf.test.TestCase):
+
+    def _random_bias(self, layer):
+        layer.bias.assign(tf.random.normal(layer.bias.shape))
+
+    def _assert_matches_single_models(self, make_layer, inputs):
+        singles = []
+        for k in range(NUM_MODELS):
+            single = make_layer(num_models=1)
+            single(inputs[k * BATCH_SIZE:(k + 1) * BATCH_SIZE])
+            self._random_bias(single)
+            singles.append(single)
+
+        stacked = make_layer(num_models=NUM_MODELS)
+        stacked(inputs)
+        stacked.kernel.assign(tf.stack([single.kernel for single in singles]))
+        stacked.bias.assign(tf.stack([single.bias for single in singles]))
+
+        outputs = stacked(inputs).numpy()
+        for k, single in enumerate(singles):
+            np.testing.assert_allclose(
+                outputs[k * BATCH_SIZE:(k + 1) * BATCH_SIZE],
+                single(inputs[k * BATCH_SIZE:(k + 1) * BATCH_SIZE]).numpy(),
+                rtol=1e-4,
+                atol=1e-4)
+
+    def test_equalized_conv2d(self):
+        inputs = tf.random.normal([NUM_MODELS * BATCH_SIZE, 8, 8, 5])
+        for kernel_size, padding in [(3, 'same'), (4, 'valid'),
+                                     (1, 'same')]:
+            self._assert_matches_single_models(
+                lambda num_models: EqualizedConv2d(num_models=num_models,
+                                                   filters=6,
+                                                   kernel_size=kernel_size,
+                                                   padding=padding),
+                inputs)
+
+    def test_equalized_dense(self):
+        inputs = tf.random.normal([NUM_MODELS * BATCH_SIZE, 16])
+        self._assert_matches_single_models(
+            lambda num_models: EqualizedDense(num_models=num_models,
+                                              units=6),
+            inputs)
+
+    def test_minibatch_standard_deviation(self):
+        for data_format, shape in [('channels_last', [4, 4, 5]),
+                                   ('channels_first', [5, 4, 4])]:
+            inputs = tf.random.normal([NUM_MODELS * BATCH_SIZE] + shape)
+            stacked = MiniBatchStandardDeviation(data_format=data_format,
+                                                 num_models=NUM_MODELS)
+            single = MiniBatchStandardDeviation(data_format=data_format)
+
+            outputs = stacked(inputs).numpy()
+            for k in range(NUM_MODELS):
+                np.testing.assert_allclose(
+                    outputs[k * BATCH_SIZE:(k + 1) * BATCH_SIZE],
+                    single(inputs[k * BATCH_SIZE:(k + 1) *
+                                  BATCH_SIZE]).numpy(),
+                    rtol=1e-5,
+                    atol=1e-5)
+
+
+if __name__ == '__main__':
+    tf.test.main()
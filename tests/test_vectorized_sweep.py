@@ -0,0 +1,95 @@
+import os
+
+import numpy as np
+import tensorflow as tf
+from easydict import EasyDict
+
+from progressive_gan.dataset_utils.pixel_store_writer import PixelStoreWriter
+from progressive_gan.model import Discriminator, Generator
+from progressive_gan.sweep import VectorizedSweep
+
+
+class VectorizedSweepTest(tf.test.TestCase):
+
+    def setUp(self):
+        super(VectorizedSweepTest, self).setUp()
+        self.data_dir = self.get_temp_dir()
+
+        writer = PixelStoreWriter(n_samples=16,
+                                  max_resolution=8,
+                                  output_dir=self.data_dir)
+        rng = np.random.default_rng(0)
+        for _ in range(16):
+            writer.push(rng.integers(0, 256, size=(8, 8, 3)))
+        writer.flush()
+
+        self.params = EasyDict({
+            'model_params': {
+                'max_resolution': 8
+            },
+            'dataloader_params': {
+                'tfrecords': os.path.join(self.data_dir, '*.tfrecord'),
+                'pixel_store': {
+                    'path': self.data_dir,
+                    'seed': 0
+                }
+            }
+        })
+
+    def test_train_step(self):
+        for learning_rates in [[1e-3], [1e-3, 1e-4]]:
+            sweep = VectorizedSweep(self.params,
+                                    learning_rates=learning_rates,
+                                    batch_size=4,
+                                    latent_dim=32,
+                                    log_dir=os.path.join(
+                                        self.data_dir,
+                                        'sweep-{}'.format(
+                                            len(learning_rates))))
+            self.assertEqual(sweep.generator.current_depth, 2)
+
+            losses = sweep.train_step()
+            for name in ['d_loss', 'g_loss']:
+                self.assertEqual(losses[name].shape, [len(learning_rates)])
+                self.assertTrue(np.all(np.isfinite(losses[name].numpy())))
+
+    def test_export_replica(self):
+        num_models = 2
+        sweep = VectorizedSweep(self.params,
+                                learning_rates=[1e-3, 1e-4],
+                                batch_size=4,
+                                latent_dim=32,
+                                log_dir=os.path.join(self.data_dir,
+                                                     'sweep-export'))
+        sweep.train_step()
+
+        noise = tf.random.normal([4, 32])
+        alpha = tf.constant(1.0)
+        stacked_images = sweep.generator(
+            (tf.tile(noise, [num_models, 1]), alpha))
+        stacked_scores = sweep.discriminator((stacked_images, alpha))
+
+        for k in range(num_models):
+            generator = Generator(max_resolution=8,
+                                  use_equalized_layers=True)
+            discriminator = Discriminator(max_resolution=8,
+                                          use_equalized_layers=True)
+            tf.train.Checkpoint(
+                generator=generator,
+                discriminator=discriminator).restore(
+                    sweep.export_replica(k)).expect_partial()
+
+            images = generator((noise, alpha))
+            np.testing.assert_allclose(images.numpy(),
+                                       stacked_images[k * 4:(k + 1) * 4],
+                                       rtol=1e-4,
+                                       atol=1e-4)
+            np.testing.assert_allclose(
+                discriminator((images, alpha)).numpy(),
+                stacked_scores[k * 4:(k + 1) * 4],
+                rtol=1e-4,
+                atol=1e-4)
+
+
+if __name__ == '__main__':
+    tf.test.main()